@@ -0,0 +1,203 @@
+"""
+Benchmark the BRW and BXR read paths of bwpy on synthetic files.
+
+Usage::
+
+    python benchmarks/run.py --frames 20000 --channels 64 64
+    python benchmarks/run.py --chunks 65536 --compression gzip --save results.json
+    python benchmarks/run.py --compare results.json --tolerance 0.25
+
+Each case reports the best wall clock time out of ``--repeat`` runs, the throughput in
+MB/s of raw data and frames per second, and the peak memory allocated during a separate,
+untimed run. With ``--compare`` the exit code is non-zero if any case got slower than the
+tolerance allows.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np  # noqa: E402
+import bwpy  # noqa: E402
+from synthetic import create_brw, create_bxr  # noqa: E402
+
+
+def brw_cases(f, raw_block):
+    n_frames = f.n_frames
+    rows, cols = f.layout.shape
+    window = min(n_frames, max(1, int(f.sampling_rate // 10)))
+    mid = n_frames // 2
+    row_band = (slice(rows // 4, rows // 2), slice(cols // 4, cols // 2))
+    # Channels spread over the layout, as in the channel groups of a BXR file.
+    n_scattered = max(1, rows * cols // 22)
+    scattered = np.random.default_rng(0).choice(rows * cols, n_scattered, replace=False)
+    return {
+        "full read": (lambda: f.data, n_frames, rows * cols),
+        "full read float32": (
+            lambda: f.read(dtype=np.float32),
+            n_frames,
+            rows * cols,
+        ),
+        "full read raw units": (lambda: f.read(convert=False), n_frames, rows * cols),
+        "single channel": (lambda: f.ch[rows // 2, cols // 2].data, n_frames, 1),
+        "scattered channels": (
+            lambda: f.ch[scattered // cols, scattered % cols].data,
+            n_frames,
+            n_scattered,
+        ),
+        "short window": (lambda: f.t[mid : mid + window].data, window, rows * cols),
+        "chained slice": (
+            lambda: f.t[:mid].ch[row_band].t[::2].ch[::2, ::2].data,
+            len(range(0, mid, 2)),
+            len(range(rows // 4, rows // 2, 2)) * len(range(cols // 4, cols // 2, 2)),
+        ),
+        "stepped read": (
+            lambda: f.t[::100].data,
+            len(range(0, n_frames, 100)),
+            rows * cols,
+        ),
+        "streamed chunks": (
+            lambda: sum(c.shape[1] for c in f.iter_chunks(frames_per_chunk=4096)),
+            n_frames,
+            rows * cols,
+        ),
+        "convert": (
+            lambda: f.convert(raw_block),
+            raw_block.shape[0],
+            raw_block.shape[1],
+        ),
+    }
+
+
+def bxr_cases(f):
+    return {
+        "channel groups": (f.get_channel_groups, None, None),
+        "channel group by id": (
+            lambda: f.get_channel_group(len(f.get_channel_group_names()) - 1),
+            None,
+            None,
+        ),
+        "channel group by name": (
+            lambda: f.get_channel_group(f.get_channel_group_names()[-1]),
+            None,
+            None,
+        ),
+    }
+
+
+def measure(fn, repeat, setup=None):
+    """
+    Best wall clock time out of `repeat` runs of `fn`, and the peak memory allocated
+    during one more run, so that tracing allocations doesn't slow down the timed runs.
+    `setup` is called before each run, outside of the timing.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def report(name, seconds, peak, n_frames, n_channels, itemsize):
+    result = {"seconds": seconds, "peak_mb": peak / 2**20}
+    line = f"{name:<28}{seconds * 1000:>10.2f} ms"
+    if n_frames is not None:
+        result["mb_s"] = n_frames * n_channels * itemsize / 2**20 / seconds
+        result["frames_s"] = n_frames / seconds
+        line += f"{result['mb_s']:>12.1f} MB/s{result['frames_s']:>14.0f} frames/s"
+    else:
+        line += " " * 37
+    line += f"{result['peak_mb']:>10.1f} MB peak"
+    print(line)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--channels", type=int, nargs=2, default=(64, 64))
+    parser.add_argument("--chunks", type=int, default=None, help="raw values per chunk")
+    parser.add_argument("--compression", default=None, choices=("gzip", "lzf"))
+    parser.add_argument("--shuffle", action="store_true")
+    parser.add_argument("--groups", type=int, default=100)
+    parser.add_argument("--group-size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mmap", action="store_true", help="open BRW files with mmap")
+    parser.add_argument("--cache-size", type=int, default=None)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with results in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    rows, cols = args.channels
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        brw_path = os.path.join(tmp, "bench.brw")
+        bxr_path = os.path.join(tmp, "bench.bxr")
+        create_brw(
+            brw_path,
+            args.frames,
+            rows,
+            cols,
+            chunks=args.chunks,
+            compression=args.compression,
+            shuffle=args.shuffle,
+        )
+        group_size = min(args.group_size, rows * cols)
+        create_bxr(bxr_path, args.groups, group_size, rows, cols)
+        size = os.path.getsize(brw_path) / 2**20
+        print(f"BRW: {args.frames} frames, {rows}x{cols} channels, {size:.1f} MB on disk")
+        with bwpy.File(brw_path, "r", mmap=args.mmap, cache_size=args.cache_size) as f:
+            raw_block = f.raw[: min(args.frames, 4096) * rows * cols].reshape(
+                -1, rows * cols
+            )
+            itemsize = f.raw.dtype.itemsize
+            for name, (fn, n_frames, n_channels) in brw_cases(f, raw_block).items():
+                seconds, peak = measure(fn, args.repeat)
+                results[name] = report(
+                    name, seconds, peak, n_frames, n_channels, itemsize
+                )
+        print(f"BXR: {args.groups} channel groups of {group_size} channels")
+        with bwpy.File(bxr_path, "r") as f:
+            for name, (fn, n_frames, n_channels) in bxr_cases(f).items():
+                # Drop the cached channel group index, so each run loads the groups.
+                seconds, peak = measure(fn, args.repeat, setup=f.invalidate_metadata)
+                results[name] = report(name, seconds, peak, n_frames, n_channels, 0)
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump({"args": vars(args), "results": results}, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)["results"]
+        regressions = [
+            f"{name}: {results[name]['seconds']:.4f}s vs {prev['seconds']:.4f}s"
+            for name, prev in baseline.items()
+            if name in results
+            and results[name]["seconds"] > prev["seconds"] * (1 + args.tolerance)
+        ]
+        if regressions:
+            print("Regressions:", *regressions, sep="\n  ")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
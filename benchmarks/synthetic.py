@@ -0,0 +1,62 @@
+"""
+Generate synthetic BRW and BXR files with the structure bwpy reads, based on the test
+samples and the BRW generator of the test suite.
+"""
+
+import os
+import sys
+import h5py
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+import helpers  # noqa: E402
+
+
+def create_brw(
+    path, n_frames, rows=64, cols=64, chunks=None, compression=None, shuffle=False, seed=0
+):
+    """
+    Write a BRW file with `n_frames` of random 12 bit data for a full `rows` x `cols`
+    chip. `chunks` is the number of raw values per HDF5 chunk of the flat raw dataset.
+    """
+    helpers.create_brw(
+        path,
+        n_frames,
+        shape=(rows, cols),
+        seed=seed,
+        chunks=(chunks,) if chunks else None,
+        compression=compression,
+        shuffle=shuffle,
+    )
+
+
+def create_bxr(path, n_groups, group_size, rows=64, cols=64, n_frames=100000, seed=0):
+    """
+    Write a BXR file with `n_groups` channel groups of `group_size` random channels.
+    """
+    rng = np.random.default_rng(seed)
+    create_brw(path, 0, rows, cols)
+    with h5py.File(helpers.get_sample_path(helpers.samples.bxr), "r") as sample:
+        with h5py.File(path, "r+") as f:
+            for k, v in sample.attrs.items():
+                f.attrs[k] = v
+            del f["3BData"]
+            f["3BRecInfo/3BRecVars/NRecFrames"][0] = n_frames
+            chs_type = f["3BRecInfo/3BMeaStreams/Raw/Chs"].dtype
+            groups = np.empty(n_groups, dtype=sample["3BUserInfo/ChsGroups"].dtype)
+            for i in range(n_groups):
+                picked = rng.choice(rows * cols, size=group_size, replace=False)
+                chs = np.empty(group_size, dtype=chs_type)
+                chs["Row"], chs["Col"] = picked // cols + 1, picked % cols + 1
+                groups[i] = (
+                    f"Group {i + 1}",
+                    (0, 255, 0, 255, 0),
+                    chs,
+                    1,
+                    np.arange(group_size // 2, dtype=np.int32),
+                )
+            user_info = f["3BUserInfo"]
+            if "ChsGroups" in user_info:
+                del user_info["ChsGroups"]
+            user_info.create_dataset("ChsGroups", data=groups)
@@ -1,15 +1,31 @@
 import h5py
+import os
 import warnings
 import numpy as np
 from ._hdf_annotations import requires_write_access
-from ._channels import Channel, ChannelGroup
+from ._channels import Channel, ChannelGroup, ChannelIndex, _ChannelGroupIndex
+from ._channels import _as_positions
+from ._recording import RecordingVariables
+from ._cache import BlockCache, CacheInfo
+from . import _reader, _parallel, _spikes, _overview, _detection, _export, _profile
+from . import _async, _decoders, _referencing
+from ._overview import ChannelStats, Overview
+from ._spikes import Spikes
+from ._batch import iter_batch, read_batch
+from ._async import AsyncReader
+from ._pool import FilePool, get_file_pool, pooled
+from ._lazy import LazyArray
 import functools
 
 __version__ = "0.0.1a0"
 
 
 class File(h5py.File):
-    def __init__(self, *args, **kwargs):
+    _profiler = None
+
+    def __init__(self, *args, mmap=False, cache_size=None, **kwargs):
+        self._mmap = mmap
+        self._cache_size = cache_size
         super().__init__(*args, **kwargs)
         self._establish_type()
 
@@ -88,12 +104,62 @@ class File(h5py.File):
     def signal_inversion(self):
         return self.get_recording_variable("SignalInversion")
 
+    @property
+    def recording_variables(self):
+        if not hasattr(self, "_recording_variables"):
+            rec_vars = self.get_raw_recording_info()["3BRecVars"]
+            self._recording_variables = RecordingVariables._from_group(rec_vars)
+        return self._recording_variables
+
     def get_recording_variable(self, var):
-        rec_info = self.get_raw_recording_info()
-        rec_vars = rec_info["3BRecVars"]
+        rec_vars = self.recording_variables.variables
         if var not in rec_vars:
             raise KeyError(f"Recording variable '{var}' not found.")
-        return rec_vars[var][0]
+        return rec_vars[var]
+
+    def invalidate_metadata(self):
+        """
+        Drop the cached metadata of the file so that it is read again on next use. Needed
+        after modifying the recording variables of a file opened for writing.
+        """
+        self.__dict__.pop("_recording_variables", None)
+        self.__dict__.pop("_channel_index", None)
+
+    def enable_profiling(self, callback=None):
+        """
+        Start counting and timing the reads of this file, see :meth:`profile_info`. The
+        optional `callback` is called after each read of a slice with a dict of what
+        that read added to the counters and timers.
+        """
+        self._profiler = _profile.Profiler(callback)
+
+    def disable_profiling(self):
+        self._profiler = None
+
+    def profile_info(self):
+        """
+        Counters and timers, in seconds, of the reads since profiling was enabled: the
+        number of slice reads, frames and values read, the number of raw reads and bytes
+        pulled from the raw data, block cache hits and misses, and the time spent reading
+        slices in total, building channel indices, reading raw data and converting it.
+        Empty when profiling is disabled.
+        """
+        if self._profiler is None:
+            return {}
+        return self._profiler.info()
+
+    def profile_clear(self):
+        if self._profiler is not None:
+            self._profiler.clear()
+
+    @property
+    def channel_index(self):
+        if not hasattr(self, "_channel_index"):
+            rec_info = self.get_raw_recording_info()
+            shape = rec_info["3BMeaChip/Layout"].shape
+            chs = rec_info["3BMeaStreams/Raw/Chs"][()]
+            self._channel_index = ChannelIndex(shape, chs)
+        return self._channel_index
 
     def get_raw_recording_info(self):
         return self["3BRecInfo"]
@@ -101,12 +167,27 @@ class File(h5py.File):
     def get_raw_user_info(self):
         return self["3BUserInfo"]
 
-    def convert(self, dv):
-        step_v = self.signal_inversion * (
-            (self.max_volt - self.min_volt) / 2**self.bit_depth
-        )
-        v_offset = self.signal_inversion * self.min_volt
-        return dv * step_v + v_offset
+    @property
+    def step_v(self):
+        return self._get_conversion()[0]
+
+    @property
+    def v_offset(self):
+        return self._get_conversion()[1]
+
+    def convert(self, dv, dtype=np.float64, out=None):
+        with _profile.timer(self._profiler, "convert_time"):
+            step_v, v_offset = self._get_conversion()
+            if out is None:
+                out = np.multiply(dv, step_v, dtype=dtype)
+            else:
+                np.multiply(dv, step_v, out=out, dtype=out.dtype)
+            out += v_offset
+            return out
+
+    def _get_conversion(self):
+        rec_vars = self.recording_variables
+        return rec_vars.step_v, rec_vars.v_offset
 
     @property
     def version(self):
@@ -129,6 +210,11 @@ class _TimeSlicer(_Slicer):
         return slice
 
 
+class _SecondsSlicer(_Slicer):
+    def __getitem__(self, instruction):
+        return self._slice._seconds_slice(instruction)
+
+
 class _ChannelSlicer(_Slicer):
     def __getitem__(self, instruction):
         slice = self._slice._channel_slice(instruction)
@@ -140,7 +226,7 @@ class _Slice:
     def __init__(self, file, channels=None, time=None):
         self._file = file
         if channels is None:
-            channels = file.channels[()].reshape(file.layout.shape)
+            channels = file.channel_index.grid
         self._channels = channels
         if time is None:
             time = slice(None)
@@ -156,62 +242,338 @@ class _Slice:
     def ch(self):
         return _ChannelSlicer(self)
 
+    @property
+    @functools.cache
+    def sec(self):
+        """
+        Time slicer in seconds from the start of the slice, instead of frames.
+        """
+        return _SecondsSlicer(self)
+
     @property
     def channels(self):
-        return self._channels
+        """
+        Layout positions of the rows of the data of the slice, in the same order once
+        flattened. Positions that weren't recorded have no data and are left out, which
+        flattens the positions of partial chip recordings.
+        """
+        recorded = self._all_columns() >= 0
+        if recorded.all():
+            return self._channels
+        return np.asarray(self._channels).ravel()[recorded]
 
     @property
     def data(self):
-        t_start, t_stop, t_step = self._time.indices(self._file.n_frames)
-        time_slice = slice(
-            t_start * self._file.n_channels,
-            t_stop * self._file.n_channels,
-            t_step * self._file.n_channels,
+        return self.read()
+
+    def read(self, dtype=None, convert=True, out=None, workers=None):
+        """
+        Read the data of the slice into a ``(channels, frames)`` array. The data is
+        converted to voltages of the given `dtype`, float64 by default, or with
+        ``convert=False`` left in the integer ADC units of the raw data. The data can be
+        written into a preallocated `out` array, whose dtype then takes precedence.
+
+        With more than 1 `workers`, the frames are split over that many processes that
+        each read and convert their part straight into a memory mapped file: `out`, if
+        it is a writable :class:`numpy.memmap`, or else a temporary file in shared
+        memory that is returned without copying it, unless an `out` array is given.
+        """
+        profiler = self._file._profiler
+        if profiler is None:
+            return self._read(dtype, convert, out, workers)
+        with profiler.read():
+            return self._read(dtype, convert, out, workers)
+
+    def _read(self, dtype, convert, out, workers):
+        profiler = self._file._profiler
+        with _profile.timer(profiler, "index_time"):
+            frames = self._frames()
+            columns = self._columns()
+        if profiler is not None:
+            profiler.count("frames", len(frames))
+            profiler.count("values", len(frames) * len(columns))
+        shape = (len(columns), len(frames))
+        if out is None:
+            if dtype is None:
+                dtype = np.float64 if convert else self._file.raw.dtype
+        elif out.shape != shape:
+            raise ValueError(f"Output array of shape {out.shape} given, {shape} needed.")
+        else:
+            dtype = out.dtype
+        if workers is not None and workers > 1 and _parallel.can_read(self._file, shape):
+            return _parallel.read_into(
+                self._file, frames, columns, out, shape, dtype, convert, workers
+            )
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        return _reader.read_into(self._file, frames, columns, out, convert)
+
+    def lazy(self, convert=True, dtype=None):
+        """
+        Lazy ``(channels, frames)`` :class:`LazyArray` of the data of the slice, that
+        only reads the part it is indexed with. The `dtype` and `convert` arguments work
+        as in :meth:`read`.
+        """
+        return LazyArray(self, convert, dtype)
+
+    def to_dask(self, convert=True, dtype=None):
+        """
+        Dask array of the data of the slice, see :meth:`lazy`, chunked along the HDF5
+        chunks of the raw data. Requires Dask.
+        """
+        return self.lazy(convert, dtype).to_dask()
+
+    async def read_async(self, dtype=None, convert=True, reader=None):
+        """
+        Read the data of the slice like :meth:`read`, in a worker thread of `reader` so
+        that the event loop isn't blocked. Without a `reader` a shared
+        :class:`AsyncReader` is used. Concurrent reads of overlapping windows are
+        coalesced, and cancelled reads stop before their next block.
+        """
+        if reader is None:
+            reader = _async.get_default_reader()
+        return await reader.read(self, dtype, convert)
+
+    def iter_chunks(self, frames_per_chunk=None, dtype=None, convert=True):
+        """
+        Iterate over the data of the slice in ``(channels, frames)`` blocks of at most
+        `frames_per_chunk` frames, so that only one block is held in memory at a time.
+        The `dtype` and `convert` arguments work as in :meth:`read`.
+        """
+        if frames_per_chunk is not None and frames_per_chunk < 1:
+            raise ValueError("`frames_per_chunk` must be a positive integer.")
+        if dtype is None:
+            dtype = np.float64 if convert else self._file.raw.dtype
+        for _, block in _reader.iter_blocks(
+            self._file, self._frames(), self._columns(), frames_per_chunk
+        ):
+            if convert:
+                yield self._file.convert(block.T, dtype=dtype)
+            else:
+                yield block.T.astype(dtype)
+
+    def stats(self, bin_frames=None, convert=False):
+        """
+        Per channel min, max, mean and standard deviation of the slice, computed in a
+        single streaming pass in raw units. The statistics are ``(channels,)`` arrays, or
+        ``(channels, bins)`` arrays when reduced per bin of `bin_frames` frames. With
+        ``convert=True`` the statistics are converted to voltages.
+        """
+        if bin_frames is not None and bin_frames < 1:
+            raise ValueError("`bin_frames` must be a positive integer.")
+        stats = _overview.compute_stats(
+            self._file, self._frames(), self._columns(), bin_frames
+        )
+        if convert:
+            stats = _overview.convert_stats(self._file, stats)
+        return stats
+
+    def export(
+        self,
+        path,
+        format=None,
+        dtype=None,
+        convert=False,
+        frames_per_chunk=None,
+        **kwargs,
+    ):
+        """
+        Write the data of the slice to `path` as a ``(frames, channels)`` array, streamed
+        in large sequential blocks. The `format` is ``"raw"`` flat binary, ``"npy"``,
+        ``"hdf5"`` or ``"zarr"``, and is otherwise guessed from the extension of `path`.
+        The data stays in the integer ADC units of the raw data unless `convert` is
+        ``True``, which needs a float `dtype`. Unsigned ADC values exported to a signed
+        `dtype`, such as the int16 many spike sorters expect, are centered on zero. HDF5
+        and Zarr stores are chunked and take extra dataset arguments, such as
+        ``compression``, as `kwargs`, which the other formats reject.
+        """
+        if frames_per_chunk is not None and frames_per_chunk < 1:
+            raise ValueError("`frames_per_chunk` must be a positive integer.")
+        _export.export(self, path, format, dtype, convert, frames_per_chunk, **kwargs)
+
+    def write_brw(self, path, chunk_frames=None, **kwargs):
+        """
+        Write the slice to a new BRW file at `path`, with the recording and user info of
+        this file and updated frame count, sampling rate and channels. The raw stream is
+        stored in chunks of `chunk_frames` frames, which can be compressed by passing
+        dataset arguments such as ``compression="gzip"`` and ``shuffle=True``.
+        """
+        if chunk_frames is not None and chunk_frames < 1:
+            raise ValueError("`chunk_frames` must be a positive integer.")
+        _export.write_brw(self, path, chunk_frames, **kwargs)
+
+    def iter_filtered(self, low, high, order=2, frames_per_chunk=None, dtype=np.float32):
+        """
+        Iterate over the data of the slice, in volts, band-pass filtered between `low`
+        and `high` Hz by a Butterworth filter of the given `order`, in ``(channels,
+        frames)`` blocks. The filter state carries over between blocks, so the blocks
+        join up into one continuous filtered signal. Requires SciPy.
+        """
+        for _, block in _detection.iter_filtered(
+            self, low, high, order, frames_per_chunk, dtype
+        ):
+            yield block
+
+    def decimate(self, factor, order=8, frames_per_chunk=None, dtype=np.float32):
+        """
+        Read the data of the slice, in volts, low-pass filtered against aliasing and
+        decimated by the integer `factor`, in one streaming pass over the slice. The
+        anti-alias filter is a Chebyshev type I filter of the given `order`, like that of
+        :func:`scipy.signal.decimate`, applied forward only. Requires SciPy.
+        """
+        blocks = list(self.iter_decimated(factor, order, frames_per_chunk, dtype))
+        if not blocks:
+            return np.empty((len(self._columns()), 0), dtype=dtype)
+        return np.concatenate(blocks, axis=1)
+
+    def iter_decimated(self, factor, order=8, frames_per_chunk=None, dtype=np.float32):
+        """
+        Iterate over the data of the slice decimated as in :meth:`decimate`, in
+        ``(channels, frames)`` blocks.
+        """
+        if int(factor) != factor or factor < 1:
+            raise ValueError("The decimation factor must be a positive integer.")
+        yield from _detection.iter_decimated(
+            self, int(factor), order, frames_per_chunk, dtype
         )
-        cols = self._file.layout.shape[1]
-        mask = np.array(
-            [(row - 1) * cols + (col - 1) for row, col in self.channels[()].ravel()]
+
+    def rereference(
+        self, mode="global", k=8, frames_per_chunk=None, dtype=np.float32, workers=None
+    ):
+        """
+        Read the data of the slice, in volts, re-referenced against the channels of the
+        slice in one streaming pass. The `mode` is ``"global"`` to subtract the mean of
+        all channels, ``"median"`` to subtract their median, or ``"knn"`` to subtract
+        the mean of the `k` nearest channels on the layout of each channel. The channels
+        can be split into row bands that are processed by `workers` threads.
+        """
+        blocks = list(
+            self.iter_rereferenced(mode, k, frames_per_chunk, dtype, workers=workers)
+        )
+        if not blocks:
+            return np.empty((len(self._columns()), 0), dtype=dtype)
+        return np.concatenate(blocks, axis=1)
+
+    def iter_rereferenced(
+        self, mode="global", k=8, frames_per_chunk=None, dtype=np.float32, workers=None
+    ):
+        """
+        Iterate over the data of the slice re-referenced as in :meth:`rereference`, in
+        ``(channels, frames)`` blocks.
+        """
+        if frames_per_chunk is not None and frames_per_chunk < 1:
+            raise ValueError("`frames_per_chunk` must be a positive integer.")
+        yield from _referencing.iter_rereferenced(
+            self, mode, k, frames_per_chunk, dtype, workers
+        )
+
+    def detect_spikes(
+        self,
+        low=300,
+        high=3000,
+        order=2,
+        threshold=5.0,
+        dead_time=0.001,
+        frames_per_chunk=None,
+        workers=None,
+    ):
+        """
+        Detect spikes as negative crossings of `threshold` times the robust noise level
+        of each channel in the band-pass filtered signal, see :meth:`iter_filtered`. The
+        noise level is estimated on the first second of the slice. Crossings within
+        `dead_time` seconds of the previous spike on a channel are ignored. The channels
+        can be split over `workers` processes. Returns a :class:`Spikes` table of the
+        frames and channel IDs, sorted by frame.
+        """
+        return _detection.detect(
+            self, low, high, order, threshold, dead_time, frames_per_chunk, workers
+        )
+
+    def iter_detect_spikes(
+        self,
+        low=300,
+        high=3000,
+        order=2,
+        threshold=5.0,
+        dead_time=0.001,
+        frames_per_chunk=None,
+    ):
+        """
+        Iterate over the spikes detected as in :meth:`detect_spikes`, yielding a
+        :class:`Spikes` table per block of frames.
+        """
+        yield from _detection.iter_detect(
+            self, low, high, order, threshold, dead_time, frames_per_chunk
         )
 
-        if len(self._file.raw) < len(mask):
+    def _frames(self):
+        n_channels = self._file.n_channels
+        n_stored = len(self._file.raw) // n_channels
+        if not n_stored:
             raise ValueError(f"You recorded less than 1 value per channel.")
+        return _reader.frame_range(self._time, min(self._file.n_frames, n_stored))
+
+    def _columns(self):
+        # Positions of the layout that weren't recorded have no column and are skipped.
+        columns = self._all_columns()
+        return columns[columns >= 0]
 
-        start, stop, step = time_slice.indices(len(self._file.raw))
-        time_ind = np.tile(mask, ((stop - start) // step, 1))
-        for i, time_sample in enumerate(range(start, stop, step)):
-            time_ind[i, :] += time_sample
-        time_ind = time_ind.reshape(-1)
-        data = np.empty(time_ind.shape)
-        for i in range(0, len(time_ind), 1000):
-            end_slice = i + 1000
-            data[i:end_slice] = self._file.raw[time_ind[i:end_slice]]
-        return self._file.convert(data.reshape((len(mask), -1)))
+    def _all_columns(self):
+        channels = np.asarray(self._channels).ravel()
+        return self._file.channel_index.get_columns(channels["Row"], channels["Col"])
 
     def _slice_index(self):
         return
 
     def _time_slice(self, instruction):
-        if isinstance(instruction, int):
-            instruction = slice(instruction, instruction + 1, 1)
+        # Compose the instruction with the current frames by slicing their range.
+        frames = _reader.frame_range(self._time, self._file.n_frames)
+        if isinstance(instruction, slice):
+            frames = frames[instruction]
+        else:
+            frame = frames[instruction]
+            frames = range(frame, frame + 1)
+        if not frames:
+            # Empty reversed ranges can start or stop at -1, which would wrap around.
+            return _Slice(self._file, self._channels, slice(0, 0, frames.step))
+        # Reversed ranges that run through the first frame stop at -1, which is None.
+        start, stop = (x if x >= 0 else None for x in (frames.start, frames.stop))
+        return _Slice(self._file, self._channels, slice(start, stop, frames.step))
+
+    def _seconds_slice(self, instruction):
+        # Seconds are relative to the start of the slice, at the rate of the slice.
+        rate = self._file.sampling_rate / abs(self._time.step or 1)
         if isinstance(instruction, slice):
-            prev_start, prev_stop, prev_step = self._time.indices(self._file.n_frames)
-            _len = (prev_stop - prev_start) // prev_step
-            this_start, this_stop, this_step = instruction.indices(_len)
-            start = prev_start + this_start * prev_step
-            stop = prev_start + this_stop * prev_step
-            step = this_step * prev_step
-            # start: 1, end: 5, step: 1 --> Slice [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10] into Slice [1, 2, 3, 4]
-            # start: 0, end: 7, step: 2 --> Slice [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10] into Slice [0, 2, 4, 6]
-            # start: 5, end: -1, step: 4 --> Slice [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10] into Slice [5, 9]
-            return _Slice(self._file, self._channels, slice(start, stop, step))
+            start, stop, step = (
+                None if x is None else int(round(x * rate))
+                for x in (instruction.start, instruction.stop, instruction.step)
+            )
+            if step == 0:
+                raise ValueError("Time step is shorter than the sampling interval.")
+            return self._time_slice(slice(start, stop, step))
+        return self._time_slice(int(round(instruction * rate)))
 
     def _channel_slice(self, instruction):
+        if isinstance(instruction, ChannelGroup):
+            instruction = instruction.positions
+        elif isinstance(instruction, list) and all(
+            isinstance(c, Channel) for c in instruction
+        ):
+            instruction = _as_positions(instruction)
+        if isinstance(instruction, np.ndarray) and instruction.dtype.names:
+            # Select the given positions, in their order, out of the current selection.
+            current = np.asarray(self._channels).ravel()
+            positions = ChannelGroup(None, instruction, None).intersection(current)
+            channels = np.empty(len(positions), dtype=current.dtype)
+            channels["Row"], channels["Col"] = positions["Row"], positions["Col"]
+            return _Slice(self._file, channels, self._time)
         return _Slice(self._file, self._channels[instruction], self._time)
 
 
 class BRWFile(File, _Slice):
     def __post_init__(self):
         _Slice.__init__(self, self)
+        self._cache = BlockCache(self, self._cache_size) if self._cache_size else None
 
     def _get_descr_prefix(self):
         return "BRW-File Level3"
@@ -224,13 +586,140 @@ class BRWFile(File, _Slice):
     def n_channels(self):
         return self.channels.shape[0]
 
+    def invalidate_metadata(self):
+        super().invalidate_metadata()
+        self.__dict__.pop("_sparse_raw", None)
+        self.cache_clear()
+
+    def cache_info(self):
+        """
+        Hits, misses, maximum and current size in bytes of the block cache.
+        """
+        if self._cache is None:
+            return CacheInfo(0, 0, 0, 0)
+        return self._cache.info()
+
+    def cache_clear(self):
+        if self._cache is not None:
+            self._cache.clear()
+
     @property
     def layout(self):
         return self["/3BRecInfo/3BMeaChip/Layout"]
 
     @property
     def raw(self):
-        return self["/3BData/Raw"]
+        if self._mmap:
+            if not hasattr(self, "_raw_map"):
+                self._raw_map = self._map_raw()
+            if self._raw_map is not None:
+                return self._raw_map
+        data = self["/3BData"]
+        if _decoders.is_sparse(data):
+            if not hasattr(self, "_sparse_raw"):
+                self._sparse_raw = _decoders.open_sparse(self, data)
+            return self._sparse_raw
+        return data["Raw"]
+
+    def _read_frames(self, frames):
+        with _profile.timer(self._profiler, "io_time"):
+            if self._cache is not None:
+                return self._cache.read_frames(frames)
+            return self._read_raw(frames)
+
+    def _can_read_runs(self):
+        # Column runs are read from HDF5 directly, cached, mapped and decoded reads use
+        # whole frames.
+        return self._cache is None and isinstance(self.raw, h5py.Dataset)
+
+    def _read_runs(self, frames, runs, width):
+        with _profile.timer(self._profiler, "io_time"):
+            if self._profiler is not None:
+                self._profiler.count("raw_reads", int(bool(len(frames))))
+                self._profiler.count(
+                    "bytes_read", len(frames) * width * self.raw.dtype.itemsize
+                )
+            return _reader.read_runs(self.raw, self.n_channels, frames, runs, width)
+
+    def _read_raw(self, frames):
+        raw = self.raw
+        if self._profiler is not None:
+            reads, nbytes = _reader.read_cost(raw, self.n_channels, frames)
+            self._profiler.count("raw_reads", reads)
+            self._profiler.count("bytes_read", nbytes)
+        return _reader.read_frames(raw, self.n_channels, frames)
+
+    def build_overview(self, path=None, bin_frames=64, factor=4):
+        """
+        Compute a min/max pyramid of the recording, see :meth:`get_overview`, and store
+        it in a sidecar HDF5 file at `path`, or in this file if no path is given, which
+        then has to be opened for writing.
+        """
+        if bin_frames < 1 or factor < 2:
+            raise ValueError("Overview bins need at least 1 frame and a factor of 2.")
+        if path is None:
+            self._build_overview_group(bin_frames, factor)
+        else:
+            # A handle of the sidecar opened by `get_overview` would block overwriting it.
+            sidecar = self.__dict__.get("_sidecars", {}).pop(os.path.realpath(path), None)
+            if sidecar:
+                sidecar.close()
+            with h5py.File(path, "w") as sidecar:
+                sidecar.attrs["GUID"] = self.attrs["GUID"]
+                group = sidecar.create_group(_overview.OVERVIEW_GROUP)
+                _overview.build_pyramid(self, group, bin_frames, factor)
+
+    def get_overview(self, path=None):
+        """
+        Return the :class:`Overview` pyramid stored in the sidecar file at `path`, or in
+        this file if no path is given, or ``None`` if no overview was built. Sidecar
+        files are opened once and closed together with this file.
+        """
+        if path is None:
+            group = self.get(_overview.OVERVIEW_GROUP)
+            return None if group is None else Overview(group)
+        sidecars = self.__dict__.setdefault("_sidecars", {})
+        key = os.path.realpath(path)
+        sidecar = sidecars.get(key)
+        if not sidecar:
+            try:
+                sidecar = h5py.File(path, "r")
+            except FileNotFoundError:
+                return None
+            if sidecar.attrs.get("GUID") != self.attrs["GUID"]:
+                sidecar.close()
+                raise ValueError(f"Overview '{path}' was built for another file.")
+            sidecars[key] = sidecar
+        return Overview(sidecar[_overview.OVERVIEW_GROUP])
+
+    @requires_write_access
+    def _build_overview_group(self, bin_frames, factor):
+        if _overview.OVERVIEW_GROUP in self:
+            del self[_overview.OVERVIEW_GROUP]
+        group = self.create_group(_overview.OVERVIEW_GROUP)
+        _overview.build_pyramid(self, group, bin_frames, factor)
+
+    def close(self):
+        # Release the memory map before the file it maps is closed.
+        self.__dict__.pop("_raw_map", None)
+        self.__dict__.pop("_sparse_raw", None)
+        for sidecar in self.__dict__.pop("_sidecars", {}).values():
+            if sidecar:
+                sidecar.close()
+        super().close()
+
+    def _map_raw(self):
+        # Only a contiguous dataset, which can't have filters, in a file stored on disk
+        # as a regular file, can be mapped. Otherwise fall back to reading through h5py.
+        raw = self["/3BData"].get("Raw")
+        if raw is None or raw.chunks is not None or self.driver not in ("sec2", "stdio"):
+            return None
+        offset = raw.id.get_offset()
+        if offset is None:
+            return None
+        return np.memmap(
+            self.filename, dtype=raw.dtype, mode="r", offset=offset, shape=raw.shape
+        )
 
 
 class BXRFile(File):
@@ -248,26 +737,86 @@ class BXRFile(File):
         return self.get_raw_user_info()["ChsGroups"]
 
     def get_channel_groups(self):
-        groups = self.get_raw_channel_groups()
-        return [ChannelGroup._from_bxr(self, data) for data in groups]
+        index = self._get_channel_group_index()
+        return [index.get(id) for id in range(len(index))]
 
     def get_channel_group_names(self):
-        return self.get_raw_channel_groups()["Name"]
+        return self._get_channel_group_index().names.copy()
 
     def get_channel_group(self, group_id):
-        groups = self.get_raw_channel_groups()
+        index = self._get_channel_group_index()
         try:
             # Try to cast to an int first so that field names can't be used as group names
             id = int(group_id)
-            data = groups[id]
-        except:
-            for group in groups:
-                if group["Name"] == group_id:
-                    data = group
-                    break
-            else:
+            if not -len(index) <= id < len(index):
+                raise IndexError()
+        except (TypeError, ValueError, IndexError):
+            id = index.find(group_id)
+            if id is None:
                 raise KeyError(f"Channel group '{group_id}' does not exist.") from None
-        return ChannelGroup._from_bxr(self, data)
-
-
-__all__ = ["File", "BRWFile", "BXRFile"]
+        return index.get(id)
+
+    def get_spikes(self, start=None, stop=None, channels=None, waveforms=False):
+        """
+        Read the spikes between the `start` and `stop` frame, optionally only those on
+        `channels`, a :class:`ChannelGroup` or channel IDs, as a :class:`Spikes` table.
+        With ``waveforms=True`` the waveforms of the spikes are read as well.
+        """
+        channels = self._get_spike_channel_ids(channels)
+        return self._get_spike_reader().read(start, stop, channels, waveforms)
+
+    def iter_spikes(
+        self, start=None, stop=None, channels=None, waveforms=False, chunk_size=None
+    ):
+        """
+        Iterate over the spikes selected as in :meth:`get_spikes`, in :class:`Spikes`
+        tables read from at most `chunk_size` stored spikes at a time.
+        """
+        if chunk_size is None:
+            chunk_size = _spikes.SPIKE_CHUNK
+        channels = self._get_spike_channel_ids(channels)
+        reader = self._get_spike_reader()
+        yield from reader.iter_chunks(start, stop, channels, waveforms, chunk_size)
+
+    def invalidate_metadata(self):
+        super().invalidate_metadata()
+        self.__dict__.pop("_channel_group_index", None)
+        self.__dict__.pop("_spike_reader", None)
+
+    def _get_spike_reader(self):
+        if not hasattr(self, "_spike_reader"):
+            events = self.get("3BResults/3BChEvents", {})
+            self._spike_reader = _spikes._SpikeReader(events)
+        return self._spike_reader
+
+    def _get_spike_channel_ids(self, channels):
+        if channels is None:
+            return None
+        if isinstance(channels, ChannelGroup):
+            positions = channels.positions
+            ids = self.channel_index.get_columns(positions["Row"], positions["Col"])
+            return ids[ids >= 0]
+        return np.asarray(channels)
+
+    def _get_channel_group_index(self):
+        if not hasattr(self, "_channel_group_index"):
+            data = self.get_raw_channel_groups()[()]
+            self._channel_group_index = _ChannelGroupIndex(self, data)
+        return self._channel_group_index
+
+
+__all__ = [
+    "File",
+    "BRWFile",
+    "BXRFile",
+    "iter_batch",
+    "read_batch",
+    "pooled",
+    "Spikes",
+    "ChannelStats",
+    "Overview",
+    "AsyncReader",
+    "FilePool",
+    "get_file_pool",
+    "LazyArray",
+]
@@ -0,0 +1,170 @@
+import asyncio
+import concurrent.futures
+import threading
+import numpy as np
+from . import _reader
+
+_default_reader = None
+
+
+def get_default_reader():
+    global _default_reader
+
+    if _default_reader is None:
+        _default_reader = AsyncReader()
+    return _default_reader
+
+
+class _Request:
+    def __init__(self, frames):
+        self.frames = frames
+        self.cancel = threading.Event()
+        self.future = None
+        self.waiters = 0
+        self.shared = False
+
+
+class AsyncReader:
+    """
+    Reads slices in a pool of worker threads for use from an asyncio event loop.
+    Requests for frames that a pending request of the same channels already reads, such
+    as the same window asked for by several clients, share that read. Requests that only
+    partly overlap a pending read, such as sliding windows, take the overlap from it and
+    only read the rest. A read is abandoned when all requests waiting on it are
+    cancelled.
+    """
+
+    def __init__(self, max_workers=None):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix="bwpy"
+        )
+        self._pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def read(self, selection, dtype=None, convert=True):
+        """
+        Read the data of the `selection` slice like :meth:`~bwpy._Slice.read`, without
+        blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        file = selection._file
+        frames = selection._frames()
+        columns = selection._columns()
+        if dtype is None:
+            dtype = np.float64 if convert else file.raw.dtype
+        dtype = np.dtype(dtype)
+        key = (id(loop), id(file), columns.tobytes(), dtype, convert)
+        args = (loop, key, file, columns, dtype, convert)
+        if frames.step < 0:
+            # Pending reads are kept in ascending order of frames.
+            return (await self._read(frames[::-1], *args))[:, ::-1]
+        return await self._read(frames, *args)
+
+    async def _read(self, frames, loop, key, file, columns, dtype, convert):
+        request, start, stop = self._find(key, frames)
+        if request is None:
+            request = _Request(frames)
+            request.future = loop.run_in_executor(
+                self._executor,
+                _read,
+                file,
+                frames,
+                columns,
+                dtype,
+                convert,
+                request.cancel,
+            )
+            self._pending.setdefault(key, []).append(request)
+            request.future.add_done_callback(lambda _: self._done(key, request))
+            data = await self._wait(request, slice(None), copy=False)
+            # Once other requests share the result, they may resume after this one, so
+            # don't hand out the shared array to be edited in place.
+            return data.copy() if request.shared else data
+        request.shared = True
+        index = _sub_index(request.frames, frames[start:stop])
+        if start == 0 and stop == len(frames):
+            return await self._wait(request, index, copy=True)
+        # Read the frames before and after the overlap, which may in turn overlap other
+        # pending reads, and join them up with the overlap.
+        args = (loop, key, file, columns, dtype, convert)
+        parts = [self._wait(request, index, copy=False)]
+        if start:
+            parts.insert(0, self._read(frames[:start], *args))
+        if stop < len(frames):
+            parts.append(self._read(frames[stop:], *args))
+        return np.concatenate(await asyncio.gather(*parts), axis=1)
+
+    async def _wait(self, request, index, copy):
+        request.waiters += 1
+        try:
+            data = await asyncio.shield(request.future)
+        except asyncio.CancelledError:
+            request.waiters -= 1
+            if not request.waiters:
+                request.cancel.set()
+                request.future.cancel()
+            raise
+        request.waiters -= 1
+        data = data[:, index]
+        return data.copy() if copy else data
+
+    def _find(self, key, frames):
+        # Look for the pending read that holds the longest part of `frames`, and return
+        # it with the start and stop index of that part in `frames`.
+        best, best_start, best_stop = None, 0, 0
+        if not len(frames):
+            return best, best_start, best_stop
+        for request in self._pending.get(key, ()):
+            if request.cancel.is_set():
+                continue
+            start, stop = _overlap(request.frames, frames)
+            if stop - start > best_stop - best_start:
+                best, best_start, best_stop = request, start, stop
+        return best, best_start, best_stop
+
+    def _done(self, key, request):
+        pending = self._pending[key]
+        pending.remove(request)
+        if not pending:
+            del self._pending[key]
+
+
+def _overlap(outer, inner):
+    # Start and stop index of the part of the ascending `inner` frames that the
+    # ascending `outer` frames also hold.
+    if not len(outer) or inner.step % outer.step or (inner[0] - outer[0]) % outer.step:
+        return 0, 0
+    start = max(0, -(-(outer[0] - inner[0]) // inner.step))
+    stop = min(len(inner), (outer[-1] - inner[0]) // inner.step + 1)
+    return start, max(start, stop)
+
+
+def _sub_index(outer, inner):
+    # The slice of `outer` that selects `inner`, or None if `inner` isn't part of it.
+    if not len(outer) or inner.step % outer.step:
+        return None
+    first, rest = divmod(inner[0] - outer[0], outer.step)
+    step = inner.step // outer.step
+    last = first + (len(inner) - 1) * step
+    if rest or step < 1 or first < 0 or last >= len(outer):
+        return None
+    return slice(first, last + 1, step)
+
+
+def _read(file, frames, columns, dtype, convert, cancel):
+    out = np.empty((len(columns), len(frames)), dtype=dtype)
+    profiler = file._profiler
+    if profiler is None:
+        return _reader.read_into(file, frames, columns, out, convert, cancel)
+    with profiler.read():
+        profiler.count("frames", len(frames))
+        profiler.count("values", out.size)
+        return _reader.read_into(file, frames, columns, out, convert, cancel)
@@ -0,0 +1,60 @@
+import concurrent.futures
+
+
+def iter_batch(paths, t=None, ch=None, workers=None, mmap=False, **kwargs):
+    """
+    Read the same slice from each BRW file in `paths` in a pool of `workers` processes
+    and yield ``(path, data)`` pairs in the order the reads complete. The slice is
+    ``file.t[t].ch[ch]``, leaving out the time or channel slice when `t` or `ch` is
+    ``None``. Extra keyword arguments are passed to :meth:`read <bwpy.BRWFile.read>`.
+    """
+    paths = list(paths)
+    for i, data in _iter_completed(paths, t, ch, workers, mmap, kwargs):
+        yield paths[i], data
+
+
+def read_batch(paths, t=None, ch=None, workers=None, callback=None, mmap=False, **kwargs):
+    """
+    Read the same slice from each BRW file in `paths` in parallel, see
+    :func:`iter_batch`. Returns the data of each file in the order of `paths`, or, if a
+    `callback` is given, calls ``callback(path, data)`` for each file in the order the
+    reads complete.
+    """
+    paths = list(paths)
+    results = [None] * len(paths)
+    for i, data in _iter_completed(paths, t, ch, workers, mmap, kwargs):
+        if callback is None:
+            results[i] = data
+        else:
+            callback(paths[i], data)
+    if callback is None:
+        return results
+
+
+def _iter_completed(paths, t, ch, workers, mmap, kwargs):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_read_file, path, t, ch, mmap, kwargs): i
+            for i, path in enumerate(paths)
+        }
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Don't start reading files whose data nobody will receive anymore.
+            for future in futures:
+                future.cancel()
+
+
+def _read_file(path, t, ch, mmap, kwargs):
+    from . import File
+
+    with File(path, "r", mmap=mmap) as file:
+        if file.type != "brw":
+            raise TypeError(f"Can't read data from '{path}', it is not a BRW file.")
+        slice = file
+        if t is not None:
+            slice = slice.t[t]
+        if ch is not None:
+            slice = slice.ch[ch]
+        return slice.read(**kwargs)
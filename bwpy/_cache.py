@@ -0,0 +1,86 @@
+import collections
+import threading
+import numpy as np
+from . import _reader
+
+#: Approximate size in bytes of the frame blocks kept in a block cache.
+CACHE_BLOCK_SIZE = 2**20
+
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class BlockCache:
+    """
+    Size bounded LRU cache of aligned blocks of raw frames of a BRW file. Each block
+    holds all channels of ``block_frames`` consecutive frames.
+    """
+
+    def __init__(self, file, maxsize):
+        self._file = file
+        self._maxsize = maxsize
+        self._blocks = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._currsize = 0
+        self._hits = 0
+        self._misses = 0
+        itemsize = file.raw.dtype.itemsize
+        self.block_frames = max(1, CACHE_BLOCK_SIZE // (file.n_channels * itemsize))
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, self._currsize)
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self._currsize = 0
+            self._hits = 0
+            self._misses = 0
+
+    def read_frames(self, frames):
+        """
+        Read an ascending `range` of frames as a ``(frames, n_channels)`` array, taking
+        the frames out of cached blocks and loading the blocks that are missing.
+        """
+        out = np.empty((len(frames), self._file.n_channels), dtype=self._file.raw.dtype)
+        if not len(frames):
+            return out
+        size = self.block_frames
+        start, step = frames.start, frames.step
+        for b in range(frames[0] // size, frames[-1] // size + 1):
+            lo = b * size
+            # Positions in `frames` of the first and past the last frame in this block.
+            i0 = max(0, -(-(lo - start) // step))
+            i1 = min(len(frames), -(-(lo + size - start) // step))
+            if i1 <= i0:
+                continue
+            block = self._get_block(b)
+            first = start + i0 * step - lo
+            out[i0:i1] = block[first : first + (i1 - i0 - 1) * step + 1 : step]
+        return out
+
+    def _get_block(self, b):
+        with self._lock:
+            block = self._blocks.get(b)
+            if block is not None:
+                self._hits += 1
+                if self._file._profiler is not None:
+                    self._file._profiler.count("cache_hits")
+                self._blocks.move_to_end(b)
+                return block
+            self._misses += 1
+            if self._file._profiler is not None:
+                self._file._profiler.count("cache_misses")
+        file = self._file
+        n_stored = len(file.raw) // file.n_channels
+        frames = range(b * self.block_frames, min((b + 1) * self.block_frames, n_stored))
+        block = np.array(file._read_raw(frames))
+        block.flags.writeable = False
+        with self._lock:
+            if block.nbytes <= self._maxsize and b not in self._blocks:
+                self._blocks[b] = block
+                self._currsize += block.nbytes
+                while self._currsize > self._maxsize:
+                    _, evicted = self._blocks.popitem(last=False)
+                    self._currsize -= evicted.nbytes
+        return block
@@ -1,9 +1,24 @@
+import numpy as np
+
+_position_type = np.dtype([("Row", "<i2"), ("Col", "<i2")])
+
+
 class Channel:
+    __slots__ = ("_bxr", "_row", "_col")
+
     def __init__(self, bxr, row, col):
         self._bxr = bxr
         self._row = row
         self._col = col
 
+    @property
+    def row(self):
+        return self._row
+
+    @property
+    def col(self):
+        return self._col
+
     @classmethod
     def _from_bxr_list(cls, bxr, bxr_list):
         return [cls._from_bxr(bxr, data) for data in bxr_list]
@@ -16,10 +31,25 @@ class Channel:
 class ChannelGroup:
     def __init__(self, name, channels, units, color=None, visible=True):
         self._name = name
-        self._channels = channels
+        self._positions = _as_positions(channels)
+        self._positions.flags.writeable = False
+        keys = _position_keys(self._positions["Row"], self._positions["Col"])
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
         self._units = units
         self._color = color
         self._visible = visible
+        self._bxr = None
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, channel):
+        if isinstance(channel, Channel):
+            row, col = channel.row, channel.col
+        else:
+            row, col = channel
+        return self.index(row, col) >= 0
 
     @property
     def name(self):
@@ -27,7 +57,14 @@ class ChannelGroup:
 
     @property
     def channels(self):
-        return self._channels.copy()
+        return [Channel(self._bxr, row, col) for row, col in self._positions.tolist()]
+
+    @property
+    def positions(self):
+        """
+        Read-only array of the ``(Row, Col)`` positions of the channels in the group.
+        """
+        return self._positions
 
     @property
     def units(self):
@@ -41,17 +78,151 @@ class ChannelGroup:
     def visible(self):
         return self._visible
 
+    def index(self, rows, cols):
+        """
+        Index in the group of each of the given positions, -1 for those not in it.
+        """
+        keys = _position_keys(rows, cols)
+        if not len(self):
+            return np.full(np.shape(keys), -1, dtype=np.intp)
+        i = np.searchsorted(self._sorted_keys, keys)
+        i = np.minimum(i, len(self) - 1)
+        return np.where(self._sorted_keys[i] == keys, self._order[i], -1)
+
+    def contains(self, rows, cols):
+        """
+        Whether each of the given positions is part of the group.
+        """
+        return self.index(rows, cols) >= 0
+
+    def intersection(self, other):
+        """
+        Positions of the group that are also in `other`, another group or an array of
+        ``(Row, Col)`` positions, in the order of this group.
+        """
+        if not isinstance(other, ChannelGroup):
+            other = ChannelGroup(None, other, None)
+        mask = other.contains(self._positions["Row"], self._positions["Col"])
+        return self._positions[mask]
+
     @classmethod
     def _from_bxr(cls, bxr, bxr_data):
-        channels = Channel._from_bxr_list(bxr, bxr_data["Chs"])
         color = _color_tuple(bxr_data["Color"])
-        return cls(
-            bxr_data["Name"],
-            channels,
+        group = cls(
+            _decode(bxr_data["Name"]),
+            bxr_data["Chs"],
             bxr_data["Units"],
             color,
             bool(bxr_data["IsVisible"]),
         )
+        group._bxr = bxr
+        return group
+
+
+class _ChannelGroupIndex:
+    """
+    Name and ID index over the channel groups of a BXR file, read from HDF5 once.
+    The :class:`ChannelGroup` objects are only created when first requested.
+    """
+
+    def __init__(self, bxr, data):
+        self._bxr = bxr
+        self._data = data
+        self.names = [_decode(name) for name in data["Name"]]
+        # Like a linear scan would, the first group with a duplicated name wins.
+        self._ids = {}
+        for id, name in enumerate(self.names):
+            self._ids.setdefault(name, id)
+        self._groups = [None] * len(data)
+
+    def __len__(self):
+        return len(self._groups)
+
+    def get(self, id):
+        group = self._groups[id]
+        if group is None:
+            group = self._groups[id] = ChannelGroup._from_bxr(self._bxr, self._data[id])
+        return group
+
+    def find(self, name):
+        return self._ids.get(name)
+
+
+class ChannelIndex:
+    """
+    Bidirectional index between the (row, col) positions on the chip layout and the
+    columns of the raw data stream, in which only the recorded channels are present.
+    Rows and columns are 1-based, as in the ``Chs`` datasets.
+    """
+
+    def __init__(self, shape, channels):
+        self._dtype = channels.dtype
+        rows = channels["Row"].astype(np.intp) - 1
+        cols = channels["Col"].astype(np.intp) - 1
+        self._positions = np.stack((rows, cols), axis=1)
+        self._columns = np.full(shape, -1, dtype=np.intp)
+        self._columns[rows, cols] = np.arange(len(channels))
+
+    @property
+    def shape(self):
+        return self._columns.shape
+
+    @property
+    def n_channels(self):
+        return len(self._positions)
+
+    @property
+    def grid(self):
+        """
+        All positions of the layout as a layout shaped array of ``Chs`` records.
+        """
+        grid = np.empty(self.shape, dtype=self._dtype)
+        rows, cols = np.indices(self.shape)
+        grid["Row"] = rows + 1
+        grid["Col"] = cols + 1
+        return grid
+
+    def get_columns(self, rows, cols):
+        """
+        Raw stream columns of the given positions, -1 for positions not recorded or
+        outside of the layout.
+        """
+        rows, cols = np.broadcast_arrays(
+            np.asarray(rows, dtype=np.intp) - 1, np.asarray(cols, dtype=np.intp) - 1
+        )
+        inside = (
+            (rows >= 0) & (rows < self.shape[0]) & (cols >= 0) & (cols < self.shape[1])
+        )
+        columns = np.full(rows.shape, -1, dtype=np.intp)
+        columns[inside] = self._columns[rows[inside], cols[inside]]
+        return columns
+
+    def get_positions(self, columns):
+        """
+        Positions of the given raw stream columns, as a tuple of row and col arrays.
+        """
+        positions = self._positions[columns] + 1
+        return positions[..., 0], positions[..., 1]
+
+
+def _as_positions(channels):
+    if isinstance(channels, np.ndarray) and channels.dtype.names:
+        positions = np.empty(len(channels), dtype=_position_type)
+        positions["Row"] = channels[channels.dtype.names[0]]
+        positions["Col"] = channels[channels.dtype.names[1]]
+        return positions
+    return np.array(
+        [(c.row, c.col) if isinstance(c, Channel) else tuple(c) for c in channels],
+        dtype=_position_type,
+    ).reshape(-1)
+
+
+def _position_keys(rows, cols):
+    return np.asarray(rows, dtype=np.int64) * 2**16 + np.asarray(cols, dtype=np.int64)
+
+
+def _decode(name):
+    return name.decode() if isinstance(name, bytes) else name
 
 
 def _color_tuple(data):
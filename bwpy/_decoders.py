@@ -0,0 +1,175 @@
+import numpy as np
+
+#: Datasets of the events-based sparse raw layout, in which noise-blanked recordings
+#: only store the segments of frames in which each channel was active.
+SPARSE_DATA = "EventsBasedSparseRaw"
+SPARSE_OFFSETS = "EventsBasedSparseRawTOC"
+SPARSE_FRAMES = "TOC"
+#: Approximate number of bytes of the sparse stream pulled from the file per read.
+READ_SIZE = 2**24
+
+
+def is_sparse(group):
+    return SPARSE_DATA in group
+
+
+class SparseRaw:
+    """
+    Flat, frame-major view of an events-based sparse raw stream that decodes the frames
+    it is sliced with, so that it can stand in for a regular raw dataset.
+
+    The stream is stored in chunks of frames. `TOC` holds the first and past the last
+    frame of each chunk and `EventsBasedSparseRawTOC` the byte offset of each chunk in
+    `EventsBasedSparseRaw`. A chunk holds, for each active channel, its int32 linear
+    index on the layout and the int32 byte size of its segments. Each segment is an
+    int64 first and past the last frame, followed by the int16 samples of those frames,
+    centered on zero. Frames outside of any segment are filled with the ADC midpoint.
+
+    The datasets are read from the ``3BData`` group of a file with BRW 3 metadata; the
+    well groups and metadata of native BRW 4 files are not supported.
+    """
+
+    chunks = None
+
+    def __init__(self, group, n_frames, layout_columns, n_channels, bit_depth):
+        self._data = group[SPARSE_DATA]
+        self._offsets = np.append(group[SPARSE_OFFSETS][()], len(self._data))
+        frames = group[SPARSE_FRAMES][()].reshape(-1, 2)
+        self._starts, self._stops = frames[:, 0], frames[:, 1]
+        self._layout_columns = layout_columns
+        self._n_channels = n_channels
+        self._midpoint = 2 ** (int(bit_depth) - 1)
+        self.dtype = np.dtype(np.uint16)
+        self.shape = (n_frames * n_channels,)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("Sparse raw data can only be sliced.")
+        start, stop, step = key.indices(len(self))
+        if step < 0 or stop <= start:
+            return np.empty(0, dtype=self.dtype)[key]
+        n = self._n_channels
+        first = start // n
+        block = self.read_frames(range(first, -(-stop // n)))
+        return block.reshape(-1)[start - first * n : stop - first * n : step]
+
+    def read_frames(self, frames):
+        """
+        Decode an ascending `range` of frames into a ``(frames, channels)`` array. Only
+        the stored chunks that hold any of the frames are read, about `READ_SIZE` bytes
+        at a time.
+        """
+        block = np.full((len(frames), self._n_channels), self._midpoint, self.dtype)
+        if not len(frames):
+            return block
+        # The first selected frame at or after the start of each chunk.
+        first = np.maximum(self._starts, frames[0])
+        first += -(first - frames[0]) % frames.step
+        chunks = np.flatnonzero((first < self._stops) & (first <= frames[-1]))
+        for group in _read_groups(chunks, self._offsets):
+            lo, hi = self._offsets[group[0]], self._offsets[group[-1] + 1]
+            buffer = np.ascontiguousarray(self._data[lo:hi]).view(np.uint8)
+            starts = self._offsets[group] - lo
+            self._decode(buffer, starts, self._offsets[group + 1] - lo, block, frames)
+        return block
+
+    def _decode(self, buffer, starts, ends, block, frames):
+        def segment_size(p):
+            return 16 + 2 * (_read(buffer, p + 8, "<i8") - _read(buffer, p, "<i8"))
+
+        records = _find_records(buffer, starts, ends)
+        columns = self._layout_columns[_read(buffer, records, "<i4")]
+        # Positions of the layout that weren't recorded have no column.
+        records, columns = records[columns >= 0], columns[columns >= 0]
+        end = records + 8 + _read(buffer, records + 4, "<i4")
+        # The segments of all records are walked in step.
+        segments, record = _walk(records + 8, end, segment_size)
+        lo = _read(buffer, segments, "<i8")
+        hi = _read(buffer, segments + 8, "<i8")
+        # Indices into `frames` of the selected frames in each segment.
+        step = frames.step
+        k0 = -(-(np.maximum(lo, frames[0]) - frames[0]) // step)
+        k1 = -(-(np.minimum(hi, frames[-1] + 1) - frames[0]) // step)
+        counts = np.maximum(k1 - k0, 0)
+        segment = np.repeat(np.arange(len(counts)), counts)
+        k = np.arange(len(segment)) - np.repeat(np.cumsum(counts) - counts, counts)
+        k += k0[segment]
+        samples = segments[segment] + 16 + 2 * (frames[0] + k * step - lo[segment])
+        block[k, columns[record[segment]]] = (
+            _read(buffer, samples, "<i2") + self._midpoint
+        )
+
+
+def _read(buffer, positions, dtype):
+    # Little endian integers of `dtype` at the byte `positions` of `buffer`, whatever
+    # their alignment, as int64.
+    dtype = np.dtype(dtype)
+    positions = np.asarray(positions, dtype=np.int64)
+    size = dtype.itemsize
+    if not np.any(positions % size):
+        return (
+            buffer[: len(buffer) // size * size]
+            .view(dtype)[positions // size]
+            .astype(np.int64)
+        )
+    index = positions[:, None] + np.arange(size)
+    return buffer[index].view(dtype)[:, 0].astype(np.int64)
+
+
+def _find_records(buffer, starts, ends):
+    # Each channel record can only be found from the size of the one before it, so this
+    # walk over the record headers is the one step that is done per record.
+    view = memoryview(buffer)
+    found = []
+    for pos, end in zip(starts.tolist(), ends.tolist()):
+        while pos < end:
+            found.append(pos)
+            pos += 8 + int.from_bytes(view[pos + 4 : pos + 8], "little", signed=True)
+    return np.array(found, dtype=np.int64)
+
+
+def _walk(pos, end, size):
+    """
+    Follow chains of consecutive records that run from each of `pos` up to `end`, all
+    in step, where `size` returns the size of the records at an array of positions.
+    Returns the positions of all records and the index of the chain they belong to.
+    """
+    chain = np.arange(len(pos))
+    found, chains = [np.empty(0, dtype=np.int64)], [chain[:0]]
+    while True:
+        keep = pos < end
+        pos, end, chain = pos[keep], end[keep], chain[keep]
+        if not len(pos):
+            return np.concatenate(found), np.concatenate(chains)
+        found.append(pos)
+        chains.append(chain)
+        pos = pos + size(pos)
+
+
+def _read_groups(chunks, offsets):
+    """
+    Split the sorted `chunks` into groups of consecutive chunks of about `READ_SIZE`
+    bytes, that are read at once.
+    """
+    group = []
+    for chunk in chunks.tolist():
+        if group and (
+            chunk != group[-1] + 1 or offsets[chunk + 1] - offsets[group[0]] > READ_SIZE
+        ):
+            yield np.array(group)
+            group = []
+        group.append(chunk)
+    if group:
+        yield np.array(group)
+
+
+def open_sparse(file, group):
+    index = file.channel_index
+    rows, cols = np.divmod(np.arange(np.prod(index.shape)), index.shape[1])
+    layout_columns = index.get_columns(rows + 1, cols + 1)
+    return SparseRaw(
+        group, file.n_frames, layout_columns, file.n_channels, file.bit_depth or 16
+    )
@@ -0,0 +1,236 @@
+import concurrent.futures
+import itertools
+import numpy as np
+from ._spikes import Spikes
+
+try:
+    import scipy.signal
+except ImportError:  # pragma: nocover
+    scipy = None
+
+#: Scale factor from the median absolute deviation to the standard deviation of noise.
+MAD_SCALE = 0.6745
+#: Length in seconds of the leading window of a recording that its noise is estimated on.
+NOISE_WINDOW = 1.0
+
+
+def _require_scipy():
+    if scipy is None:  # pragma: nocover
+        raise ImportError(
+            "Filtering requires SciPy, install it with `pip install bwpy[signal]`."
+        )
+
+
+class SOSFilter:
+    """
+    Filter of second-order sections applied to consecutive ``(channels, frames)``
+    blocks, carrying the filter state of each channel over from one block to the next.
+    """
+
+    def __init__(self, sos):
+        self._sos = sos
+        self._zi = None
+
+    def __call__(self, block):
+        if self._zi is None:
+            # Start from the steady state of the first sample to avoid a step response.
+            zi = scipy.signal.sosfilt_zi(self._sos)
+            self._zi = zi[:, None, :] * block[None, :, :1]
+        filtered, self._zi = scipy.signal.sosfilt(self._sos, block, axis=-1, zi=self._zi)
+        return filtered
+
+
+class BandpassFilter(SOSFilter):
+    """
+    Butterworth band-pass filter of consecutive blocks, see :class:`SOSFilter`.
+    """
+
+    def __init__(self, low, high, sampling_rate, order=2):
+        _require_scipy()
+        super().__init__(
+            scipy.signal.butter(
+                order, (low, high), btype="bandpass", fs=sampling_rate, output="sos"
+            )
+        )
+
+
+class AntiAliasFilter(SOSFilter):
+    """
+    Chebyshev type I low-pass filter of consecutive blocks that are to be decimated by
+    `factor`, with the design that :func:`scipy.signal.decimate` uses.
+    """
+
+    def __init__(self, factor, order=8):
+        _require_scipy()
+        super().__init__(scipy.signal.cheby1(order, 0.05, 0.8 / factor, output="sos"))
+
+
+class ThresholdDetector:
+    """
+    Detects negative threshold crossings in consecutive filtered ``(channels, frames)``
+    blocks. The threshold of each channel is `threshold` times a robust estimate of its
+    noise, ``median(|x|) / 0.6745``, made once with :meth:`estimate_noise` or otherwise on
+    the first block. Crossings within `dead_time` frames of the previous spike on a
+    channel, also in a previous block, are ignored.
+    """
+
+    def __init__(self, n_channels, threshold=5.0, dead_time=0):
+        self._threshold = threshold
+        self._dead_time = dead_time
+        self._noise = None
+        self._below = np.zeros(n_channels, dtype=bool)
+        self._last = np.full(n_channels, -np.iinfo(np.int64).max // 2, dtype=np.int64)
+
+    def estimate_noise(self, window):
+        """
+        Estimate the noise of each channel on a ``(channels, frames)`` `window`, and use
+        it for the thresholds of all blocks.
+        """
+        self._noise = np.median(np.abs(window), axis=1) / MAD_SCALE
+
+    def __call__(self, block, first):
+        """
+        Return the channel indices and block positions of the spikes in `block`, whose
+        first frame has index `first` in the stream of blocks.
+        """
+        if self._noise is None:
+            self.estimate_noise(block)
+        below = block < -self._threshold * self._noise[:, None]
+        previous = np.concatenate((self._below[:, None], below[:, :-1]), axis=1)
+        self._below = below[:, -1].copy()
+        channels, positions = np.nonzero(below & ~previous)
+        if self._dead_time:
+            keep = self._apply_dead_time(channels, positions + first)
+            channels, positions = channels[keep], positions[keep]
+        return channels, positions
+
+    def _apply_dead_time(self, channels, positions):
+        # Crossings are ordered per channel. A crossing is a spike when it is far enough
+        # from the last spike on its channel, which is at most the previous crossing.
+        start = np.ones(len(channels), dtype=bool)
+        start[1:] = channels[1:] != channels[:-1]
+        last = np.where(start, self._last[channels], np.roll(positions, 1))
+        keep = positions - last >= self._dead_time
+        # Crossings close to a previous crossing that was dropped itself depend on the
+        # spike before that one, so resolve those chains one link at a time.
+        last = np.where(keep, positions, last)
+        pending = ~keep & ~start
+        while pending.any():
+            links = np.flatnonzero(pending & ~np.roll(pending, 1))
+            keep[links] = positions[links] - last[links - 1] >= self._dead_time
+            last[links] = np.where(keep[links], positions[links], last[links - 1])
+            pending[links] = False
+        np.maximum.at(self._last, channels[keep], positions[keep])
+        return keep
+
+
+def iter_filtered(slice, low, high, order, frames_per_chunk, dtype):
+    """
+    Yield ``(offset, block)`` pairs of band-pass filtered ``(channels, frames)`` blocks of
+    `slice`, where `offset` is the position of the block in the selected frames.
+    """
+    frames = slice._frames()
+    if frames.step < 0:
+        raise ValueError("Can't filter a slice running backwards in time.")
+    sampling_rate = slice._file.sampling_rate / frames.step
+    filter = BandpassFilter(low, high, sampling_rate, order)
+    if frames_per_chunk is None:
+        frames_per_chunk = max(1, int(sampling_rate))
+    offset = 0
+    for block in slice.iter_chunks(frames_per_chunk, dtype=dtype):
+        yield offset, filter(block).astype(dtype, copy=False)
+        offset += block.shape[1]
+
+
+def iter_decimated(slice, factor, order, frames_per_chunk, dtype):
+    """
+    Yield anti-alias filtered ``(channels, frames)`` blocks of `slice`, in volts, keeping
+    every `factor`-th frame of the stream of blocks.
+    """
+    frames = slice._frames()
+    if frames.step < 0:
+        raise ValueError("Can't decimate a slice running backwards in time.")
+    filter = AntiAliasFilter(factor, order)
+    if frames_per_chunk is None:
+        sampling_rate = slice._file.sampling_rate / frames.step
+        frames_per_chunk = max(factor, int(sampling_rate) // factor * factor)
+    offset = 0
+    for block in slice.iter_chunks(frames_per_chunk, dtype=dtype):
+        # Keep the frames at multiples of `factor` in the whole stream.
+        first = -offset % factor
+        yield filter(block)[:, first::factor].astype(dtype, copy=False)
+        offset += block.shape[1]
+
+
+def iter_detect(slice, low, high, order, threshold, dead_time, frames_per_chunk):
+    """
+    Yield a :class:`Spikes` table per block of `slice` with the frames and channel IDs of
+    the spikes detected in it.
+    """
+    frames = slice._frames()
+    columns = slice._columns()
+    dead_frames = int(round(dead_time * slice._file.sampling_rate / abs(frames.step)))
+    detector = ThresholdDetector(len(columns), threshold, dead_frames)
+    blocks = iter_filtered(slice, low, high, order, frames_per_chunk, np.float32)
+    # Estimate the noise once on a leading window, so that the thresholds don't depend on
+    # the size of the blocks.
+    window = max(1, int(NOISE_WINDOW * slice._file.sampling_rate / abs(frames.step)))
+    leading = []
+    for offset, block in blocks:
+        leading.append((offset, block))
+        if offset + block.shape[1] >= window:
+            break
+    if leading:
+        detector.estimate_noise(
+            np.concatenate([b for _, b in leading], axis=1)[:, :window]
+        )
+    for offset, block in itertools.chain(leading, blocks):
+        channels, positions = detector(block, offset)
+        sort = np.lexsort((channels, positions))
+        times = np.asarray(frames[offset : offset + block.shape[1]])[positions[sort]]
+        yield Spikes(times.astype(np.int64), columns[channels[sort]].astype(np.int32))
+
+
+def detect(slice, low, high, order, threshold, dead_time, frames_per_chunk, workers):
+    """
+    Detect the spikes of `slice`, optionally in `workers` processes that each handle a
+    subset of the channels, and return them sorted by time as a :class:`Spikes` table.
+    """
+    args = (low, high, order, threshold, dead_time, frames_per_chunk)
+    columns = slice._columns()
+    file = slice._file
+    if workers is None or workers < 2 or file.driver not in ("sec2", "stdio"):
+        tables = list(iter_detect(slice, *args))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _detect_part,
+                    file.filename,
+                    file._mmap,
+                    slice._time,
+                    part,
+                    args,
+                )
+                for part in np.array_split(columns, workers)
+                if len(part)
+            ]
+            tables = [future.result() for future in futures]
+    times = np.concatenate([np.empty(0, np.int64)] + [t.times for t in tables])
+    channels = np.concatenate([np.empty(0, np.int32)] + [t.channels for t in tables])
+    sort = np.lexsort((channels, times))
+    return Spikes(times[sort], channels[sort])
+
+
+def _detect_part(path, mmap, time, columns, args):
+    from . import File, _Slice
+
+    with File(path, "r", mmap=mmap) as file:
+        rows, cols = file.channel_index.get_positions(columns)
+        channels = np.empty(len(columns), dtype=file.channel_index.grid.dtype)
+        channels["Row"], channels["Col"] = rows, cols
+        tables = list(iter_detect(_Slice(file, channels, time), *args))
+    return Spikes(
+        np.concatenate([np.empty(0, np.int64)] + [t.times for t in tables]),
+        np.concatenate([np.empty(0, np.int32)] + [t.channels for t in tables]),
+    )
@@ -0,0 +1,146 @@
+import os
+import uuid
+import h5py
+import numpy as np
+from . import _reader
+
+try:
+    import zarr
+except ImportError:  # pragma: nocover
+    zarr = None
+
+#: Export formats by file extension, any other extension is written as flat binary.
+FORMATS = {".npy": "npy", ".h5": "hdf5", ".hdf5": "hdf5", ".zarr": "zarr"}
+#: Approximate size in bytes of the chunks of exported HDF5 and Zarr stores.
+EXPORT_CHUNK_SIZE = 2**20
+
+
+def export(slice, path, format, dtype, convert, frames_per_chunk, **kwargs):
+    """
+    Stream the frames and columns of `slice` into a ``(frames, channels)`` array at
+    `path`, one large block at a time.
+    """
+    file = slice._file
+    frames = slice._frames()
+    columns = slice._columns()
+    if format is None:
+        format = FORMATS.get(os.path.splitext(os.fspath(path))[1].lower(), "raw")
+    if format not in ("raw", "npy", "hdf5", "zarr"):
+        raise ValueError(f"Unknown export format '{format}'.")
+    if dtype is None:
+        dtype = np.float64 if convert else file.raw.dtype
+    dtype = np.dtype(dtype)
+    if convert and dtype.kind not in "fc":
+        raise ValueError(f"Can't export values in volts as {dtype}, use a float dtype.")
+    shift = 0
+    if not convert and file.raw.dtype.kind == "u" and dtype.kind == "i":
+        # Center unsigned ADC values on zero, as signed sample formats expect.
+        shift = 2 ** (int(file.bit_depth or file.raw.dtype.itemsize * 8) - 1)
+    shape = (len(frames), len(columns))
+    blocks = (
+        _convert_block(file, block, dtype, convert, shift)
+        for _, block in _reader.iter_blocks(file, frames, columns, frames_per_chunk)
+    )
+    if format in ("raw", "npy"):
+        if kwargs:
+            options = ", ".join(kwargs)
+            raise TypeError(
+                f"Unexpected storage options for the {format} format: {options}."
+            )
+        with open(path, "wb") as fh:
+            if format == "npy":
+                header = {
+                    "descr": np.lib.format.dtype_to_descr(dtype),
+                    "fortran_order": False,
+                    "shape": shape,
+                }
+                np.lib.format.write_array_header_2_0(fh, header)
+            for block in blocks:
+                fh.write(np.ascontiguousarray(block).data)
+        return
+    if 0 in shape:
+        # Stores can't have chunks larger than empty data.
+        chunks = None
+    else:
+        chunks = (max(1, min(shape[0], _chunk_frames(shape[1], dtype))), shape[1])
+    if format == "hdf5":
+        with h5py.File(path, "w") as store:
+            data = store.create_dataset(
+                "data", shape=shape, dtype=dtype, chunks=chunks, **kwargs
+            )
+            _write_store(file, frames, data, blocks, convert, shift)
+    else:
+        if zarr is None:  # pragma: nocover
+            raise ImportError(
+                "Zarr export requires Zarr, install it with `pip install bwpy[zarr]`."
+            )
+        data = zarr.open_array(
+            path, mode="w", shape=shape, dtype=dtype, chunks=chunks, **kwargs
+        )
+        _write_store(file, frames, data, blocks, convert, shift)
+
+
+def _chunk_frames(n_columns, dtype):
+    return EXPORT_CHUNK_SIZE // (max(1, n_columns) * dtype.itemsize)
+
+
+def _convert_block(file, block, dtype, convert, shift):
+    if convert:
+        return file.convert(block, dtype=dtype)
+    if shift:
+        return (block.astype(np.int64) - shift).astype(dtype)
+    return block.astype(dtype, copy=False)
+
+
+def _write_store(file, frames, data, blocks, convert, shift):
+    offset = 0
+    for block in blocks:
+        data[offset : offset + len(block)] = block
+        offset += len(block)
+    # Store what's needed to interpret the exported values.
+    data.attrs["SamplingRate"] = float(file.sampling_rate / abs(frames.step))
+    if not convert:
+        data.attrs["StepV"] = float(file.step_v)
+        data.attrs["VOffset"] = float(file.v_offset + shift * file.step_v)
+
+
+def write_brw(slice, path, chunk_frames, **kwargs):
+    """
+    Write the frames and columns of `slice` to a new BRW file at `path`, with the raw
+    stream stored in chunks of `chunk_frames` frames.
+    """
+    file = slice._file
+    frames = slice._frames()
+    columns = slice._columns()
+    n_columns = max(1, len(columns))
+    if chunk_frames is None:
+        chunk_frames = _chunk_frames(n_columns, file.raw.dtype)
+    chunk_frames = max(1, min(chunk_frames, len(frames)))
+    # Write whole chunks at a time, so that compressed chunks are written only once.
+    length = _reader.block_length(file.n_channels, file.raw.dtype.itemsize, frames.step)
+    length = max(1, length // chunk_frames) * chunk_frames
+    with h5py.File(path, "w") as brw:
+        for key, value in file.attrs.items():
+            brw.attrs[key] = value
+        brw.attrs["GUID"] = np.bytes_(str(uuid.uuid4()))
+        for group in ("3BRecInfo", "3BUserInfo"):
+            if group in file:
+                file.copy(file[group], brw)
+        streams = brw["3BRecInfo/3BMeaStreams/Raw"]
+        chs = file.channels[()][columns]
+        del streams["Chs"]
+        streams.create_dataset("Chs", data=chs)
+        rec_vars = brw["3BRecInfo/3BRecVars"]
+        rec_vars["NRecFrames"][0] = len(frames)
+        rec_vars["SamplingRate"][0] = file.sampling_rate / abs(frames.step)
+        raw = brw.create_group("3BData").create_dataset(
+            "Raw",
+            shape=(len(frames) * len(columns),),
+            dtype=file.raw.dtype,
+            # An empty raw stream can't hold a chunk.
+            chunks=(chunk_frames * n_columns,) if len(frames) and len(columns) else None,
+            **kwargs,
+        )
+        for offset, block in _reader.iter_blocks(file, frames, columns, length):
+            start = offset * len(columns)
+            raw[start : start + block.size] = block.reshape(-1)
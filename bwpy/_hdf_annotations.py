@@ -7,5 +7,6 @@ def requires_write_access(f):
         if self.mode != "r+":
             raise RuntimeError(f"Missing required write intent on file.")
         f(self, *args, **kwargs)
+        self.invalidate_metadata()
 
     return write_access_required
@@ -0,0 +1,168 @@
+import math
+import weakref
+import numpy as np
+from . import _pool, _reader
+
+try:
+    import dask.array
+    import dask.base
+except ImportError:  # pragma: nocover
+    dask = None
+
+
+class LazyArray:
+    """
+    Lazy ``(channels, frames)`` array of the data of a slice, that only reads the
+    values it is indexed with. It can be passed to NumPy functions as an array, and to
+    Dask, in whose chunks it is split along the HDF5 chunks of the raw data. It can be
+    pickled if the file is on disk, and is then read from a handle of the file pool.
+    """
+
+    def __init__(self, slice, convert=True, dtype=None):
+        self._slice = slice
+        self._convert = convert
+        if dtype is None:
+            dtype = np.float64 if convert else slice._file.raw.dtype
+        self._dtype = np.dtype(dtype)
+        self._frames = slice._frames()
+        self._columns = slice._columns()
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return f"<LazyArray shape={self.shape} dtype={self.dtype}>"
+
+    @property
+    def shape(self):
+        return (len(self._columns), len(self._frames))
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def ndim(self):
+        return 2
+
+    @property
+    def size(self):
+        return math.prod(self.shape)
+
+    @property
+    def chunks(self):
+        """
+        Dask chunk sizes along the channels and frames, with the channels in a single
+        chunk, because every raw chunk holds all channels of its frames, and chunk
+        boundaries along the frames that line up with those of the raw chunks.
+        """
+        return ((len(self._columns),), _frame_chunks(self._slice._file, self._frames))
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError(
+                "A lazy array can't be turned into an array without reading it."
+            )
+        data = self[:, :]
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = key.index(Ellipsis)
+            key = key[:i] + (slice(None),) * (3 - len(key)) + key[i + 1 :]
+        if len(key) > 2:
+            raise IndexError("Too many indices for a 2-dimensional array.")
+        key += (slice(None),) * (2 - len(key))
+        ch, t = key
+        columns = self._columns[ch]
+        if isinstance(t, (slice, int, np.integer)):
+            frames = self._frames[t]
+            data = self._read(np.atleast_1d(columns), _as_range(frames))
+        else:
+            # Read the frames spanned by an index array, then pick them out.
+            index = np.arange(len(self._frames))[t]
+            span = range(index.min(), index.max() + 1) if index.size else range(0)
+            data = self._read(
+                np.atleast_1d(columns), self._frames[span.start : span.stop]
+            )
+            data = data[:, np.asarray(index) - span.start]
+        if np.ndim(columns) == 0:
+            data = data[0]
+        if not isinstance(t, slice) and np.ndim(t) == 0:
+            data = data[..., 0]
+        return data
+
+    def _read(self, columns, frames):
+        out = np.empty((len(columns), len(frames)), dtype=self._dtype)
+        return _reader.read_into(self._slice._file, frames, columns, out, self._convert)
+
+    def to_dask(self):
+        """
+        Dask array of the data, read lazily per chunk, see :attr:`chunks`.
+        """
+        if dask is None:  # pragma: nocover
+            raise ImportError(
+                "Dask arrays require Dask, install it with `pip install bwpy[dask]`."
+            )
+        name = "bwpy-" + dask.base.tokenize(self.__getstate__())
+        return dask.array.from_array(
+            self, chunks=self.chunks, name=name, asarray=True, lock=False
+        )
+
+    def __getstate__(self):
+        file = self._slice._file
+        return {
+            "path": file.filename,
+            "mmap": file._mmap,
+            "channels": self._slice._channels,
+            "time": self._slice._time,
+            "convert": self._convert,
+            "dtype": self._dtype,
+        }
+
+    def __setstate__(self, state):
+        from . import _Slice
+
+        # Borrow a shared handle for as long as this array exists.
+        handle = _pool.get_file_pool().open(state["path"], mmap=state["mmap"])
+        file = handle.__enter__()
+        weakref.finalize(self, handle.__exit__, None, None, None)
+        self.__init__(
+            _Slice(file, state["channels"], state["time"]),
+            state["convert"],
+            state["dtype"],
+        )
+
+
+def _as_range(frames):
+    if isinstance(frames, range):
+        return frames
+    return range(frames, frames + 1)
+
+
+def _frame_chunks(file, frames):
+    """
+    Sizes of consecutive chunks of `frames` split at multiples of a number of frames
+    that is aligned to the raw chunks and holds about `BLOCK_SIZE` bytes.
+    """
+    n_channels = file.n_channels
+    itemsize = file.raw.dtype.itemsize
+    target = max(1, _reader.BLOCK_SIZE // (n_channels * itemsize))
+    chunks = getattr(file.raw, "chunks", None)
+    if chunks:
+        # The smallest number of frames that spans a whole number of raw chunks.
+        aligned = math.lcm(chunks[0], n_channels) // n_channels
+        target = max(1, target // aligned) * aligned
+    if not len(frames):
+        return (0,)
+    start, step = frames[0], frames.step
+    lo, hi = min(frames[0], frames[-1]), max(frames[0], frames[-1])
+    edges = np.arange(-(-(lo + 1) // target) * target, hi + 1, target)
+    if step > 0:
+        index = -(-(edges - start) // step)
+    else:
+        index = (start - edges[::-1]) // -step + 1
+    bounds = np.unique(np.concatenate(([0], index, [len(frames)])))
+    return tuple(int(n) for n in np.diff(bounds) if n)
@@ -0,0 +1,167 @@
+import collections
+import numpy as np
+from . import _reader
+
+ChannelStats = collections.namedtuple("ChannelStats", ["min", "max", "mean", "std"])
+
+#: Name of the HDF5 group that holds an overview pyramid.
+OVERVIEW_GROUP = "bwpyOverview"
+
+
+def iter_bins(file, frames, columns, bin_frames):
+    """
+    Yield ``(offset, min, max, sum, sum_sq, count)`` reductions over consecutive bins of
+    `bin_frames` of the selected `frames`, as ``(bins, columns)`` arrays, in one
+    streaming pass in raw units. `offset` is the index of the first bin.
+    """
+    length = _reader.block_length(file.n_channels, file.raw.dtype.itemsize, frames.step)
+    length = max(1, length // bin_frames) * bin_frames
+    for offset, block in _reader.iter_blocks(file, frames, columns, length):
+        starts = np.arange(0, len(block), bin_frames)
+        values = block.astype(np.float64)
+        yield (
+            offset // bin_frames,
+            np.minimum.reduceat(block, starts),
+            np.maximum.reduceat(block, starts),
+            np.add.reduceat(values, starts),
+            np.add.reduceat(values * values, starts),
+            np.diff(np.append(starts, len(block))),
+        )
+
+
+def compute_stats(file, frames, columns, bin_frames=None):
+    """
+    Per channel min, max, mean and standard deviation in raw units, over all `frames`
+    or per bin of `bin_frames`, as ``(columns,)`` or ``(columns, bins)`` arrays.
+    """
+    if not len(frames):
+        raise ValueError("Can't compute statistics of an empty slice.")
+    per_bin = bin_frames is not None
+    if not per_bin:
+        bin_frames = len(frames)
+    n_bins = -(-len(frames) // bin_frames)
+    shape = (n_bins, len(columns))
+    lo = np.empty(shape, dtype=file.raw.dtype)
+    hi = np.empty(shape, dtype=file.raw.dtype)
+    total = np.zeros(shape)
+    total_sq = np.zeros(shape)
+    counts = np.zeros(n_bins)
+    if per_bin:
+        for b, bmin, bmax, bsum, bsq, n in iter_bins(file, frames, columns, bin_frames):
+            lo[b : b + len(n)], hi[b : b + len(n)] = bmin, bmax
+            total[b : b + len(n)], total_sq[b : b + len(n)] = bsum, bsq
+            counts[b : b + len(n)] = n
+    else:
+        lo[0] = np.iinfo(lo.dtype).max if lo.dtype.kind in "ui" else np.inf
+        hi[0] = np.iinfo(hi.dtype).min if hi.dtype.kind in "ui" else -np.inf
+        for _, block in _reader.iter_blocks(file, frames, columns):
+            values = block.astype(np.float64)
+            np.minimum(lo[0], block.min(axis=0), out=lo[0])
+            np.maximum(hi[0], block.max(axis=0), out=hi[0])
+            total[0] += values.sum(axis=0)
+            total_sq[0] += (values * values).sum(axis=0)
+        counts[0] = len(frames)
+    mean = total / counts[:, None]
+    std = np.sqrt(np.maximum(total_sq / counts[:, None] - mean * mean, 0))
+    stats = ChannelStats(lo.T, hi.T, mean.T, std.T)
+    if not per_bin:
+        stats = ChannelStats(*(s[:, 0] for s in stats))
+    return stats
+
+
+def convert_stats(file, stats):
+    """
+    Convert statistics in raw units to voltages.
+    """
+    lo, hi = file.convert(stats.min), file.convert(stats.max)
+    if file.step_v < 0:
+        # An inverted signal swaps the extremes.
+        lo, hi = hi, lo
+    return ChannelStats(lo, hi, file.convert(stats.mean), stats.std * abs(file.step_v))
+
+
+def build_pyramid(file, group, bin_frames, factor):
+    """
+    Write a min/max pyramid of the whole recording into `group`. Level 0 reduces bins
+    of `bin_frames` frames, each next level reduces `factor` bins of the previous one,
+    until a level has a single bin.
+    """
+    frames = file._frames()
+    columns = np.arange(file.n_channels)
+    n_bins = -(-len(frames) // bin_frames)
+    level = _create_level(group, 0, bin_frames, file.n_channels, n_bins, file.raw.dtype)
+    for b, bmin, bmax, *_ in iter_bins(file, frames, columns, bin_frames):
+        level["min"][:, b : b + len(bmin)] = bmin.T
+        level["max"][:, b : b + len(bmax)] = bmax.T
+    i = 0
+    while n_bins > 1:
+        prev = level
+        n_bins = -(-n_bins // factor)
+        bin_frames *= factor
+        i += 1
+        level = _create_level(
+            group, i, bin_frames, file.n_channels, n_bins, prev["min"].dtype
+        )
+        itemsize = prev["min"].dtype.itemsize
+        step = (
+            max(1, _reader.BLOCK_SIZE // (file.n_channels * itemsize * factor)) * factor
+        )
+        for start in range(0, prev["min"].shape[1], step):
+            pmin = prev["min"][:, start : start + step]
+            pmax = prev["max"][:, start : start + step]
+            starts = np.arange(0, pmin.shape[1], factor)
+            b = start // factor
+            level["min"][:, b : b + len(starts)] = np.minimum.reduceat(
+                pmin, starts, axis=1
+            )
+            level["max"][:, b : b + len(starts)] = np.maximum.reduceat(
+                pmax, starts, axis=1
+            )
+    group.attrs["Levels"] = i + 1
+    group.attrs["NFrames"] = len(frames)
+
+
+def _create_level(group, i, bin_frames, n_channels, n_bins, dtype):
+    level = group.create_group(f"Level{i}")
+    level.attrs["BinFrames"] = bin_frames
+    chunks = (min(n_channels, 64), min(n_bins, 4096))
+    for name in ("min", "max"):
+        level.create_dataset(name, shape=(n_channels, n_bins), dtype=dtype, chunks=chunks)
+    return level
+
+
+class Overview:
+    """
+    Multi-resolution min/max pyramid of a recording. Level 0 has the finest bins, each
+    level's ``min`` and ``max`` datasets are ``(channels, bins)``, with the channels in
+    raw stream order, and are read lazily.
+    """
+
+    def __init__(self, group):
+        self._group = group
+        self._levels = [group[f"Level{i}"] for i in range(group.attrs["Levels"])]
+
+    def __len__(self):
+        return len(self._levels)
+
+    @property
+    def n_frames(self):
+        return int(self._group.attrs["NFrames"])
+
+    @property
+    def bin_frames(self):
+        return [int(level.attrs["BinFrames"]) for level in self._levels]
+
+    def min(self, level):
+        return self._levels[level]["min"]
+
+    def max(self, level):
+        return self._levels[level]["max"]
+
+    def get_level(self, frames_per_bin):
+        """
+        The coarsest level whose bins hold at most `frames_per_bin` frames, for example
+        the number of frames per pixel of a plot.
+        """
+        fitting = [i for i, b in enumerate(self.bin_frames) if b <= frames_per_bin]
+        return fitting[-1] if fitting else 0
@@ -0,0 +1,90 @@
+import concurrent.futures
+import mmap
+import os
+import tempfile
+import numpy as np
+from . import _reader
+
+
+def can_read(file, shape):
+    # Workers open the file themselves, so it has to be a file on disk.
+    return 0 not in shape and file.driver in ("sec2", "stdio")
+
+
+def read_into(file, frames, columns, out, shape, dtype, convert, workers):
+    """
+    Read `frames` and `columns` of `file` like :func:`._reader.read_into`, in `workers`
+    processes that each read a contiguous part of the frames straight into a memory
+    mapped output file. When `out` is a writable memory map of a file, that is the
+    output. Otherwise the output is a temporary file, kept in shared memory where the OS
+    offers it, whose mapping is returned when no `out` array is given, and otherwise
+    copied into `out`.
+    """
+    if file.mode == "r+":
+        file.flush()
+    if _is_file_map(out):
+        _read_parts(file, frames, columns, convert, workers, out)
+        return out
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    fd, path = tempfile.mkstemp(prefix="bwpy-", suffix=".out", dir=directory)
+    os.close(fd)
+    try:
+        data = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+        _read_parts(file, frames, columns, convert, workers, data)
+        if out is not None:
+            out[()] = data
+            del data
+            return out
+        data = data.view(np.ndarray)
+        try:
+            # The mapping outlives the file on POSIX systems.
+            os.remove(path)
+        except PermissionError:  # pragma: nocover
+            # Files that are in use can't be removed on Windows, so copy the data out.
+            data = data.copy()
+        return data
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _is_file_map(out):
+    # Only memory maps that own their mapping, not views of them, have a valid offset.
+    return (
+        isinstance(out, np.memmap)
+        and isinstance(out.base, mmap.mmap)
+        and out.mode in ("r+", "w+")
+        and out.flags.c_contiguous
+    )
+
+
+def _read_parts(file, frames, columns, convert, workers, target):
+    per_worker = -(-len(frames) // workers)
+    target = (target.filename, target.offset, target.shape, target.dtype)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _read_part,
+                file.filename,
+                file._mmap,
+                frames[start : start + per_worker],
+                columns,
+                convert,
+                target,
+                start,
+            )
+            for start in range(0, len(frames), per_worker)
+        ]
+        for future in futures:
+            future.result()
+
+
+def _read_part(path, use_mmap, frames, columns, convert, target, start):
+    from . import File
+
+    filename, offset, shape, dtype = target
+    out = np.memmap(filename, dtype=dtype, mode="r+", offset=offset, shape=shape)
+    with File(path, "r", mmap=use_mmap) as file:
+        _reader.read_into(
+            file, frames, columns, out[:, start : start + len(frames)], convert
+        )
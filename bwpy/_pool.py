@@ -0,0 +1,163 @@
+import collections
+import contextlib
+import os
+import threading
+import weakref
+from ._cache import CacheInfo
+
+#: Number of idle handles kept open by the default file pool.
+DEFAULT_POOL_SIZE = 16
+
+
+class _Entry:
+    def __init__(self):
+        self.file = None
+        self.users = 0
+        self.retired = False
+        # Set once the file is opened, or failed to open with `error`.
+        self.ready = threading.Event()
+        self.error = None
+
+
+class FilePool:
+    """
+    Size bounded LRU pool of open read-only file handles, keyed by the path and the
+    modification time of the file, so that a file that changed on disk is reopened.
+    Handles are shared by all users of the pool and only closed once they're idle.
+    """
+
+    def __init__(self, maxsize=DEFAULT_POOL_SIZE):
+        self._maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        # Forked children can't use the HDF5 handles of their parent.
+        if hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: ref() and ref()._forget())
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def clear(self):
+        """
+        Close all idle handles, handles in use are closed once they're released.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                self._close(key)
+            self._hits = 0
+            self._misses = 0
+
+    @contextlib.contextmanager
+    def open(self, path, mmap=False, cache_size=None):
+        """
+        Context manager that lends out a pooled handle of the file at `path`, opened in
+        read mode with the given `mmap` and `cache_size` options. The handle must not be
+        closed by the borrower.
+        """
+        entry = self._acquire(path, mmap, cache_size)
+        try:
+            yield entry.file
+        finally:
+            with self._lock:
+                entry.users -= 1
+                if entry.retired and not entry.users and entry.file:
+                    entry.file.close()
+                self._evict()
+
+    def _acquire(self, path, mmap, cache_size):
+        from . import File
+
+        stat = os.stat(path)
+        path = os.path.realpath(path)
+        key = (path, stat.st_mtime_ns, stat.st_size, mmap, cache_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            # Handles closed by a borrower anyway are reopened.
+            opener = entry is None or (entry.ready.is_set() and not entry.file)
+            if opener:
+                self._misses += 1
+                if entry is not None:
+                    self._close(key)
+                # Handles of older versions of the file won't be used again.
+                for stale in list(self._entries):
+                    if stale[0] == path and stale[1:3] != key[1:3]:
+                        self._close(stale)
+                entry = _Entry()
+                self._entries[key] = entry
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            entry.users += 1
+            self._evict()
+        # Open the file outside of the lock, so that a slow open doesn't hold up the
+        # users of other files. Users of the same file wait until it's opened.
+        if opener:
+            try:
+                file = File(path, "r", mmap=mmap, cache_size=cache_size)
+            except BaseException as e:
+                with self._lock:
+                    entry.error = e
+                    entry.users -= 1
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+                    entry.ready.set()
+                raise
+            with self._lock:
+                entry.file = file
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                with self._lock:
+                    entry.users -= 1
+                raise entry.error
+        return entry
+
+    def _evict(self):
+        # Close the least recently used idle handles until the pool fits.
+        excess = len(self._entries) - self._maxsize
+        for key, entry in list(self._entries.items()):
+            if excess <= 0:
+                break
+            if not entry.users:
+                self._close(key)
+                excess -= 1
+
+    def _close(self, key):
+        # Handles in use are closed by their last user instead.
+        entry = self._entries.pop(key)
+        entry.retired = True
+        if not entry.users and entry.file:
+            entry.file.close()
+
+    def _forget(self):
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_file_pool():
+    """
+    The process wide :class:`FilePool` used by :func:`pooled`.
+    """
+    global _default_pool
+
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = FilePool()
+        return _default_pool
+
+
+def pooled(path, mmap=False, cache_size=None):
+    """
+    Borrow a shared read-only handle of the file at `path` from the process wide file
+    pool, see :meth:`FilePool.open`.
+    """
+    return get_file_pool().open(path, mmap=mmap, cache_size=cache_size)
@@ -0,0 +1,68 @@
+import collections
+import contextlib
+import time
+
+#: Counters and timers every profile starts out with.
+PROFILE_KEYS = (
+    "reads",
+    "frames",
+    "values",
+    "raw_reads",
+    "bytes_read",
+    "cache_hits",
+    "cache_misses",
+    "read_time",
+    "index_time",
+    "io_time",
+    "convert_time",
+)
+
+
+_NO_TIMER = contextlib.nullcontext()
+
+
+def timer(profiler, key):
+    """
+    Time a block of code if profiling is enabled, and otherwise do nothing.
+    """
+    return _NO_TIMER if profiler is None else profiler.timer(key)
+
+
+class Profiler:
+    """
+    Counters and timers, in seconds, of the read path of a file. Each read of a slice
+    is reported to the `callback` as a dict of what it added to the totals.
+    """
+
+    def __init__(self, callback=None):
+        self._callback = callback
+        self._totals = collections.Counter(dict.fromkeys(PROFILE_KEYS, 0))
+
+    def info(self):
+        return dict(self._totals)
+
+    def clear(self):
+        self._totals = collections.Counter(dict.fromkeys(PROFILE_KEYS, 0))
+
+    def count(self, key, n=1):
+        self._totals[key] += n
+
+    @contextlib.contextmanager
+    def timer(self, key):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._totals[key] += time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def read(self):
+        """
+        Time a read of a slice and report it to the callback.
+        """
+        before = self.info()
+        with self.timer("read_time"):
+            yield
+        self._totals["reads"] += 1
+        if self._callback is not None:
+            self._callback({k: v - before[k] for k, v in self._totals.items()})
@@ -0,0 +1,184 @@
+import concurrent.futures
+import h5py
+import numpy as np
+from . import _decoders
+
+#: Approximate number of bytes pulled from the raw dataset per hyperslab read.
+BLOCK_SIZE = 2**24
+#: Largest frame step for which the whole frame span is read and then subsampled. Above
+#: it the selected frames are read one by one.
+MAX_SPAN_STEP = 8
+#: Largest fraction of the channels for which only the selected columns are read, as
+#: runs of consecutive columns, instead of whole frames.
+MAX_RUN_FRACTION = 0.5
+#: Largest number of runs of consecutive columns that are read on their own. HDF5 slows
+#: down more than linearly with the number of blocks in a selection, so more scattered
+#: columns are picked out of whole frames instead.
+MAX_RUNS = 4
+#: Largest number of hyperslab blocks, one per run per frame, in a single run read.
+MAX_RUN_BLOCKS = 2**15
+
+
+def frame_range(time, n_frames):
+    return range(*time.indices(n_frames))
+
+
+def block_length(n_channels, itemsize, step=1):
+    """
+    Number of selected frames per block so that each read stays close to `BLOCK_SIZE`.
+    """
+    span = abs(step) if abs(step) <= MAX_SPAN_STEP else 1
+    return max(1, BLOCK_SIZE // (n_channels * itemsize * span))
+
+
+def column_index(columns):
+    """
+    Turn an array of raw stream columns into a slice when they're contiguous, so that
+    picking them out of a block is a view instead of a fancy indexing copy.
+    """
+    columns = np.asarray(columns, dtype=np.intp)
+    if len(columns) and np.all(np.diff(columns) == 1):
+        return slice(int(columns[0]), int(columns[-1]) + 1)
+    return columns
+
+
+def column_runs(columns):
+    """
+    Sorted unique `columns` and the ``(start, stop)`` runs of consecutive columns in them.
+    """
+    unique = np.unique(np.asarray(columns, dtype=np.intp))
+    breaks = np.flatnonzero(np.diff(unique) != 1) + 1
+    starts = unique[np.concatenate(([0], breaks))] if len(unique) else unique
+    stops = (
+        unique[np.concatenate((breaks - 1, [len(unique) - 1]))] + 1
+        if len(unique)
+        else unique
+    )
+    return unique, list(zip(starts.tolist(), stops.tolist()))
+
+
+def use_runs(raw, n_channels, width, n_runs):
+    """
+    Whether reading `n_runs` runs of `width` columns in total from the flat raw HDF5
+    dataset beats reading whole frames: only for a few runs of a small enough part of
+    the channels, from contiguous storage, since chunks are read whole regardless.
+    """
+    return (
+        0 < n_runs <= MAX_RUNS
+        and width <= n_channels * MAX_RUN_FRACTION
+        and raw.chunks is None
+    )
+
+
+def read_runs(raw, n_channels, frames, runs, width):
+    """
+    Read the column `runs` of an ascending `range` of frames from the flat raw HDF5
+    dataset, with a single read of the union of one strided hyperslab per run, as a
+    ``(frames, width)`` array of the columns of the runs in order.
+    """
+    out = np.empty((len(frames), width), dtype=raw.dtype)
+    if not out.size:
+        return out
+    space = raw.id.get_space()
+    space.select_none()
+    stride = frames.step * n_channels
+    for start, stop in runs:
+        space.select_hyperslab(
+            (frames[0] * n_channels + start,),
+            (len(frames),),
+            (stride,),
+            (stop - start,),
+            op=h5py.h5s.SELECT_OR,
+        )
+    raw.id.read(h5py.h5s.create_simple((out.size,)), space, out)
+    return out
+
+
+def read_frames(raw, n_channels, frames):
+    """
+    Read an ascending `range` of frames from the flat raw stream as a
+    ``(frames, n_channels)`` array.
+    """
+    if not len(frames):
+        return np.empty((0, n_channels), dtype=raw.dtype)
+    if isinstance(raw, _decoders.SparseRaw):
+        return raw.read_frames(frames)
+    if frames.step <= MAX_SPAN_STEP or isinstance(raw, np.ndarray):
+        # Arrays, such as memory maps, return views so the span costs nothing.
+        first, last = frames[0], frames[-1] + 1
+        block = raw[first * n_channels : last * n_channels]
+        return block.reshape(-1, n_channels)[:: frames.step]
+    block = np.empty((len(frames), n_channels), dtype=raw.dtype)
+    for i, frame in enumerate(frames):
+        block[i] = raw[frame * n_channels : (frame + 1) * n_channels]
+    return block
+
+
+def read_cost(raw, n_channels, frames):
+    """
+    Number of reads and bytes that :func:`read_frames` pulls from `raw` for `frames`.
+    """
+    if not len(frames):
+        return 0, 0
+    itemsize = raw.dtype.itemsize * n_channels
+    if frames.step <= MAX_SPAN_STEP or not isinstance(raw, h5py.Dataset):
+        return 1, (frames[-1] - frames[0] + 1) * itemsize
+    return len(frames), len(frames) * itemsize
+
+
+def iter_blocks(file, frames, columns, length=None):
+    """
+    Yield ``(offset, block)`` pairs that cover `frames` of `file`, where each block is a
+    raw ``(frames, columns)`` array and `offset` its position in the selected frames.
+    When a few runs of columns are selected only those are read, if the file supports it
+    and :func:`use_runs` deems it faster.
+    """
+    unique, runs = column_runs(columns)
+    if file._can_read_runs() and use_runs(
+        file.raw, file.n_channels, len(unique), len(runs)
+    ):
+        yield from _iter_run_blocks(file, frames, columns, unique, runs, length)
+        return
+    columns = column_index(columns)
+    if length is None:
+        length = block_length(file.n_channels, file.raw.dtype.itemsize, frames.step)
+    for offset in range(0, len(frames), length):
+        sub = frames[offset : offset + length]
+        if sub.step < 0:
+            block = file._read_frames(sub[::-1])[::-1]
+        else:
+            block = file._read_frames(sub)
+        yield offset, block[:, columns]
+
+
+def _iter_run_blocks(file, frames, columns, unique, runs, length):
+    width = len(unique)
+    if length is None:
+        length = max(1, BLOCK_SIZE // (width * file.raw.dtype.itemsize))
+        length = min(length, max(1, MAX_RUN_BLOCKS // len(runs)))
+    # Positions of the requested columns among the sorted columns that are read.
+    pick = column_index(np.searchsorted(unique, columns))
+    for offset in range(0, len(frames), length):
+        sub = frames[offset : offset + length]
+        if sub.step < 0:
+            block = file._read_runs(sub[::-1], runs, width)[::-1]
+        else:
+            block = file._read_runs(sub, runs, width)
+        yield offset, block[:, pick]
+
+
+def read_into(file, frames, columns, out, convert=True, cancel=None):
+    """
+    Read `frames` and `columns` of the raw data of `file` into the ``(columns, frames)``
+    `out` array, converted to voltages unless `convert` is ``False``. When the optional
+    `cancel` event is set the read is abandoned before the next block.
+    """
+    for offset, block in iter_blocks(file, frames, columns):
+        if cancel is not None and cancel.is_set():
+            raise concurrent.futures.CancelledError()
+        target = out[:, offset : offset + len(block)]
+        if convert:
+            file.convert(block.T, out=target)
+        else:
+            target[()] = block.T
+    return out
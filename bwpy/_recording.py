@@ -0,0 +1,46 @@
+import dataclasses
+import types
+import typing
+
+
+@dataclasses.dataclass(frozen=True)
+class RecordingVariables:
+    """
+    Immutable snapshot of the ``3BRecInfo/3BRecVars`` of a file. Variables missing from
+    the file are ``None``, all stored variables are kept as read in `variables`.
+    """
+
+    bit_depth: typing.Optional[int]
+    experiment_type: typing.Optional[int]
+    max_volt: typing.Optional[float]
+    min_volt: typing.Optional[float]
+    n_frames: typing.Optional[int]
+    sampling_rate: typing.Optional[float]
+    signal_inversion: typing.Optional[float]
+    variables: typing.Mapping[str, typing.Any]
+
+    @property
+    def step_v(self):
+        return self.signal_inversion * (self.max_volt - self.min_volt) / 2**self.bit_depth
+
+    @property
+    def v_offset(self):
+        return self.signal_inversion * self.min_volt
+
+    @classmethod
+    def _from_group(cls, group):
+        variables = {name: dataset[0] for name, dataset in group.items()}
+
+        def get(var, cast):
+            return cast(variables[var]) if var in variables else None
+
+        return cls(
+            get("BitDepth", int),
+            get("ExperimentType", int),
+            get("MaxVolt", float),
+            get("MinVolt", float),
+            get("NRecFrames", int),
+            get("SamplingRate", float),
+            get("SignalInversion", float),
+            types.MappingProxyType(variables),
+        )
@@ -0,0 +1,100 @@
+import concurrent.futures
+import numpy as np
+
+#: Re-referencing modes: subtract the mean or median of all channels of the slice, or
+#: the mean of the k nearest channels on the layout.
+MODES = ("global", "median", "knn")
+
+
+def neighbour_table(rows, cols, k):
+    """
+    Indices of the `k` nearest other positions on the layout of each of the given
+    positions, as an ``(positions, k)`` array. Ties in distance are broken by the
+    position of the neighbour, row first.
+    """
+    n = len(rows)
+    if not 0 < k < n:
+        raise ValueError(f"Can't pick {k} neighbours out of {n} channels.")
+    rows = np.asarray(rows, dtype=np.intp)
+    cols = np.asarray(cols, dtype=np.intp)
+    lo_r, lo_c = rows.min(), cols.min()
+    grid = np.full((rows.max() - lo_r + 1, cols.max() - lo_c + 1), -1, dtype=np.intp)
+    grid[rows - lo_r, cols - lo_c] = np.arange(n)
+    radius = 1
+    while True:
+        # Look the neighbours up in a window of growing radius, nearest offsets first.
+        dr, dc = np.mgrid[-radius : radius + 1, -radius : radius + 1].reshape(2, -1)
+        order = np.lexsort((dc, dr, dr * dr + dc * dc))[1:]
+        dr, dc = dr[order], dc[order]
+        r = rows[:, None] - lo_r + dr
+        c = cols[:, None] - lo_c + dc
+        inside = (r >= 0) & (r < grid.shape[0]) & (c >= 0) & (c < grid.shape[1])
+        candidates = np.where(inside, grid[r * inside, c * inside], -1)
+        valid = candidates >= 0
+        # Only complete if every neighbour beyond the window would be farther away.
+        complete = np.sum(valid & (dr * dr + dc * dc <= radius * radius), axis=1) >= k
+        if complete.all() or radius >= max(grid.shape):
+            break
+        radius *= 2
+    first = np.argsort(~valid, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(candidates, first, axis=1)
+
+
+class Referencer:
+    """
+    Re-references consecutive ``(channels, frames)`` blocks of the channels at the given
+    layout positions. With more than 1 `workers` the channels are split into bands of
+    layout rows that are re-referenced in parallel threads.
+    """
+
+    def __init__(self, rows, cols, mode="global", k=8, workers=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown re-referencing mode '{mode}', pick from {MODES}.")
+        self._mode = mode
+        self._neighbours = neighbour_table(rows, cols, k) if mode == "knn" else None
+        self._pool = None
+        self._bands = [slice(None)]
+        if workers is not None and workers > 1:
+            self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            bands = np.array_split(np.unique(rows), workers)
+            self._bands = [np.flatnonzero(np.isin(rows, b)) for b in bands if len(b)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def __call__(self, block):
+        reference = None
+        if self._mode == "global":
+            reference = block.mean(axis=0)
+        elif self._mode == "median":
+            reference = np.median(block, axis=0)
+        out = np.empty_like(block)
+
+        def apply(band):
+            if reference is None:
+                out[band] = block[band] - block[self._neighbours[band]].mean(axis=1)
+            else:
+                out[band] = block[band] - reference
+
+        if self._pool is None:
+            apply(self._bands[0])
+        else:
+            list(self._pool.map(apply, self._bands))
+        return out
+
+
+def iter_rereferenced(slice, mode, k, frames_per_chunk, dtype, workers):
+    """
+    Yield re-referenced ``(channels, frames)`` blocks of `slice`, in volts.
+    """
+    rows, cols = slice._file.channel_index.get_positions(slice._columns())
+    with Referencer(rows, cols, mode, k, workers) as referencer:
+        for block in slice.iter_chunks(frames_per_chunk, dtype=dtype):
+            yield referencer(block)
@@ -0,0 +1,142 @@
+import numpy as np
+
+#: Number of spikes read per chunk when streaming spikes.
+SPIKE_CHUNK = 2**20
+
+
+class Spikes:
+    """
+    Columnar table of spikes: the frame at which each spike occurred, the ID of its
+    channel in the raw stream, and optionally its waveform and unit.
+    """
+
+    def __init__(self, times, channels, waveforms=None, units=None):
+        self._times = times
+        self._channels = channels
+        self._waveforms = waveforms
+        self._units = units
+
+    def __len__(self):
+        return len(self._times)
+
+    @property
+    def times(self):
+        return self._times
+
+    @property
+    def channels(self):
+        return self._channels
+
+    @property
+    def waveforms(self):
+        return self._waveforms
+
+    @property
+    def units(self):
+        return self._units
+
+
+class _SpikeReader:
+    """
+    Reads the spike datasets of a BXR file in bulk. When the spike times are sorted,
+    which is checked once, time windows are located by binary search on the dataset.
+    """
+
+    def __init__(self, events):
+        self._times = events.get("SpikeTimes")
+        self._channels = events.get("SpikeChIDs")
+        self._forms = events.get("SpikeForms")
+        self._units = events.get("SpikeUnits")
+        self._sorted = None
+
+    def __len__(self):
+        return 0 if self._times is None else len(self._times)
+
+    @property
+    def waveform_length(self):
+        if self._forms is None or not len(self):
+            return 0
+        return len(self._forms) // len(self)
+
+    @property
+    def sorted(self):
+        if self._sorted is None:
+            self._sorted = True
+            last = None
+            for i in range(0, len(self), SPIKE_CHUNK):
+                times = self._times[i : i + SPIKE_CHUNK]
+                if np.any(np.diff(times) < 0) or (last is not None and times[0] < last):
+                    self._sorted = False
+                    break
+                last = times[-1]
+        return self._sorted
+
+    def iter_chunks(self, start, stop, channels, waveforms, chunk_size):
+        i0, i1 = 0, len(self)
+        if self.sorted:
+            if start is not None:
+                i0 = self._bisect(start)
+            if stop is not None:
+                i1 = self._bisect(stop)
+        length = self.waveform_length
+        if waveforms and self._forms is None and len(self):
+            raise KeyError("No spike waveforms found.")
+        for i in range(i0, i1, chunk_size):
+            j = min(i + chunk_size, i1)
+            times = self._times[i:j]
+            ids = self._channels[i:j]
+            mask = np.ones(len(times), dtype=bool)
+            if start is not None:
+                mask &= times >= start
+            if stop is not None:
+                mask &= times < stop
+            if channels is not None:
+                mask &= np.isin(ids, channels)
+            forms = None
+            if waveforms:
+                forms = self._forms[i * length : j * length].reshape(-1, length)[mask]
+            units = None if self._units is None else self._units[i:j][mask]
+            yield Spikes(times[mask], ids[mask], forms, units)
+
+    def read(self, start, stop, channels, waveforms):
+        chunks = list(self.iter_chunks(start, stop, channels, waveforms, SPIKE_CHUNK))
+        if not chunks:
+            return self._empty(waveforms)
+        if len(chunks) == 1:
+            return chunks[0]
+
+        def cat(arrays):
+            return None if arrays[0] is None else np.concatenate(arrays)
+
+        return Spikes(
+            cat([c.times for c in chunks]),
+            cat([c.channels for c in chunks]),
+            cat([c.waveforms for c in chunks]),
+            cat([c.units for c in chunks]),
+        )
+
+    def _empty(self, waveforms):
+        def empty(dataset, dtype, shape=(0,)):
+            return np.empty(shape, dtype=dtype if dataset is None else dataset.dtype)
+
+        return Spikes(
+            empty(self._times, np.int64),
+            empty(self._channels, np.int32),
+            (
+                empty(self._forms, np.int16, (0, self.waveform_length))
+                if waveforms
+                else None
+            ),
+            None if self._units is None else empty(self._units, None),
+        )
+
+    def _bisect(self, frame):
+        # Index of the first spike at or after `frame`, reading single elements only.
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._times[mid] < frame:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
@@ -56,6 +56,7 @@ html_static_path = ["_static"]
 intersphinx_mapping = {
     "python": ("https://docs.python.org/3", None),
     "h5py": ("https://docs.h5py.org/en/stable/", None),
+    "numpy": ("https://numpy.org/doc/stable/", None),
 }
 
 autodoc_mock_imports = ["h5py", "numpy"]
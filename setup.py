@@ -25,5 +25,10 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     install_requires=["h5py", "numpy"],
-    extras_require={"dev": ["sphinx", "furo"]},
+    extras_require={
+        "dev": ["sphinx", "furo"],
+        "signal": ["scipy"],
+        "zarr": ["zarr"],
+        "dask": ["dask[array]"],
+    },
 )
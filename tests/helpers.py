@@ -1,4 +1,8 @@
 import os
+import tempfile
+import unittest
+import h5py
+import numpy as np
 import bwpy
 
 
@@ -23,3 +27,58 @@ def open_sample_copy(sample):
     return bwpy.File(
         get_sample_path(sample), mode="a", driver="core", backing_store=False
     )
+
+
+def create_brw(path, n_frames, shape=(64, 64), channels=None, seed=0, **dataset_kw):
+    """
+    Create a BRW file at `path` with the metadata of the BRW sample and `n_frames` of
+    random data for the given `channels`, or the full `shape` chip. Extra keyword
+    arguments are passed to the creation of the raw dataset (chunks, compression, ...).
+    Returns the raw data as a ``(frames, channels)`` array.
+    """
+    rows, cols = shape
+    if channels is None:
+        channels = [(r, c) for r in range(1, rows + 1) for c in range(1, cols + 1)]
+    with h5py.File(get_sample_path(samples.brw), "r") as sample:
+        with h5py.File(path, "w") as f:
+            for k, v in sample.attrs.items():
+                f.attrs[k] = v
+            for group in ("3BRecInfo", "3BUserInfo"):
+                sample.copy(group, f)
+            chip = f["3BRecInfo/3BMeaChip"]
+            del chip["Layout"]
+            chip.create_dataset("Layout", data=np.ones(shape, dtype=np.uint8))
+            chip["NRows"][0] = rows
+            chip["NCols"][0] = cols
+            streams = f["3BRecInfo/3BMeaStreams/Raw"]
+            chs_type = streams["Chs"].dtype
+            del streams["Chs"]
+            streams.create_dataset("Chs", data=np.array(channels, dtype=chs_type))
+            f["3BRecInfo/3BRecVars/NRecFrames"][0] = n_frames
+            data = np.random.default_rng(seed).integers(
+                0, 4096, size=(n_frames, len(channels)), dtype=np.uint16
+            )
+            f.create_group("3BData").create_dataset(
+                "Raw", data=data.reshape(-1), **dataset_kw
+            )
+    return data
+
+
+class SyntheticBRWTestCase(unittest.TestCase):
+    """
+    Test case that opens a freshly generated 8x8 channel, 200 frame BRW file.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "synthetic.brw")
+        self.raw = create_brw(self.path, 200, shape=(8, 8))
+        self.file = bwpy.File(self.path, "r")
+
+    def tearDown(self):
+        self.file.close()
+        self._dir.cleanup()
+
+    def expected(self, frames, rows=slice(None), cols=slice(None)):
+        grid = np.arange(64).reshape(8, 8)[rows, cols].reshape(-1)
+        return self.file.convert(self.raw[frames][:, grid].T)
@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+import numpy as np
+import bwpy
+from helpers import SyntheticBRWTestCase
+
+
+class TestAsyncRead(SyntheticBRWTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reader = bwpy.AsyncReader(max_workers=2)
+
+    def tearDown(self):
+        self.reader.close()
+        super().tearDown()
+
+    def test_read(self):
+        async def read():
+            return await self.file.t[10:90].ch[2:4, :].read_async(reader=self.reader)
+
+        data = asyncio.run(read())
+        self.assertTrue(np.array_equal(self.file.t[10:90].ch[2:4, :].data, data))
+
+    def test_default_reader(self):
+        data = asyncio.run(self.file.ch[0, 0].read_async(convert=False))
+        self.assertTrue(np.array_equal(self.raw[:, :1].T, data))
+
+    def test_coalesce(self):
+        windows = [slice(0, 200), slice(0, 200), slice(20, 60), slice(30, 190, 4)]
+        self.file.enable_profiling()
+
+        async def read():
+            return await asyncio.gather(
+                *(self.file.t[w].read_async(reader=self.reader) for w in windows)
+            )
+
+        results = asyncio.run(read())
+        # All windows are part of the first one, so they're all served by one read.
+        self.assertEqual(1, self.file.profile_info()["raw_reads"])
+        for window, data in zip(windows, results):
+            with self.subTest(window=window):
+                self.assertTrue(np.array_equal(self.file.t[window].data, data))
+        # Clients of a coalesced read get their own copy of the data.
+        self.assertFalse(np.shares_memory(results[0], results[1]))
+
+    def test_edit_in_place(self):
+        async def read(clear):
+            data = await self.file.t[0:200].read_async(reader=self.reader)
+            if clear:
+                data[:] = 0
+            return data
+
+        async def read_all():
+            return await asyncio.gather(read(True), read(False), read(False))
+
+        results = asyncio.run(read_all())
+        # Editing one result doesn't change the results of the other clients.
+        self.assertFalse(results[0].any())
+        for data in results[1:]:
+            self.assertTrue(np.array_equal(self.file.t[0:200].data, data))
+
+    def test_sliding_windows(self):
+        windows = [slice(0, 100), slice(50, 150), slice(100, 200), slice(190, 30, -2)]
+        self.file.enable_profiling()
+
+        async def read():
+            return await asyncio.gather(
+                *(
+                    self.file.t[w].read_async(reader=self.reader, convert=False)
+                    for w in windows
+                )
+            )
+
+        results = asyncio.run(read())
+        # Only the part of each window that no earlier window reads is read.
+        self.assertEqual(self.raw.nbytes, self.file.profile_info()["bytes_read"])
+        for window, data in zip(windows, results):
+            with self.subTest(window=window):
+                self.assertTrue(np.array_equal(self.raw[window].T, data))
+
+    def test_cancel(self):
+        async def read():
+            task = asyncio.ensure_future(self.file.read_async(reader=self.reader))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return await self.file.t[:5].read_async(reader=self.reader)
+
+        data = asyncio.run(read())
+        self.assertTrue(np.array_equal(self.file.t[:5].data, data))
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import bwpy
+from helpers import create_brw, get_sample_path, samples
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.paths = [os.path.join(self._dir.name, f"{i}.brw") for i in range(3)]
+        self.raws = [
+            create_brw(path, 40 + 10 * i, shape=(4, 4), seed=i)
+            for i, path in enumerate(self.paths)
+        ]
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def expected(self, path, t, ch):
+        with bwpy.File(path, "r") as f:
+            return f.t[t].ch[ch].data
+
+    def test_read_batch(self):
+        results = bwpy.read_batch(
+            self.paths, t=slice(5, 35, 2), ch=(1, slice(None)), workers=2
+        )
+        self.assertEqual(3, len(results))
+        for path, data in zip(self.paths, results):
+            self.assertEqual((4, 15), data.shape)
+            self.assertTrue(
+                np.allclose(self.expected(path, slice(5, 35, 2), (1, slice(None))), data)
+            )
+
+    def test_read_options(self):
+        results = bwpy.read_batch(self.paths, ch=(0, 0), convert=False, workers=2)
+        for raw, data in zip(self.raws, results):
+            self.assertTrue(np.array_equal(raw[:, :1].T, data))
+
+    def test_callback(self):
+        received = {}
+        ret = bwpy.read_batch(
+            self.paths, t=3, workers=2, callback=lambda p, d: received.update({p: d})
+        )
+        self.assertIsNone(ret)
+        self.assertEqual(set(self.paths), set(received))
+        self.assertEqual((16, 1), received[self.paths[0]].shape)
+
+    def test_iter_batch(self):
+        paths = [
+            path for path, data in bwpy.iter_batch(self.paths, t=slice(10), workers=2)
+        ]
+        self.assertEqual(sorted(self.paths), sorted(paths))
+
+    def test_bxr_error(self):
+        with self.assertRaises(TypeError):
+            bwpy.read_batch([get_sample_path(samples.bxr)], workers=1)
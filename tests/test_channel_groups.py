@@ -69,3 +69,58 @@ class TestChannelGroupProperties(unittest.TestCase):
             group = f.get_channel_group(0)
             self.assertIs(tuple, type(group.color))
             self.assertEqual(4, len(group.color))
+
+
+class TestChannelGroupArrays(unittest.TestCase):
+    def test_positions(self):
+        with open_sample(samples.bxr, "r") as f:
+            group = f.get_channel_group(0)
+        self.assertEqual(183, len(group))
+        self.assertEqual((8, 13), tuple(group.positions[0]))
+        with self.assertRaises(ValueError):
+            group.positions["Row"][0] = 1
+        channel = group.channels[1]
+        self.assertEqual((8, 14), (channel.row, channel.col))
+
+    def test_membership(self):
+        with open_sample(samples.bxr, "r") as f:
+            group = f.get_channel_group(0)
+        self.assertIn((9, 12), group)
+        self.assertIn(group.channels[-1], group)
+        self.assertNotIn((1, 1), group)
+        self.assertEqual([2, -1, 0], list(group.index([9, 1, 8], [12, 1, 13])))
+        self.assertEqual([True, False], list(group.contains([9, 1], [12, 1])))
+
+    def test_intersection(self):
+        with open_sample(samples.bxr, "r") as f:
+            group = f.get_channel_group(0)
+        other = bwpy.ChannelGroup("other", [(1, 1), (9, 13), (8, 13)], None)
+        common = group.intersection(other)
+        self.assertEqual([(8, 13), (9, 13)], [tuple(p) for p in common])
+        self.assertEqual(183, len(group.intersection(group.positions)))
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            bwpy.Channel(None, 1, 1).trash = 5
+
+
+class TestChannelGroupIndex(unittest.TestCase):
+    def test_cached_groups(self):
+        with open_sample(samples.bxr, "r") as f:
+            group = f.get_channel_group("Group 1")
+            self.assertIs(group, f.get_channel_group(0))
+            self.assertIs(group, f.get_channel_group(-1))
+            self.assertIs(group, f.channel_groups[0])
+            self.assertIsNot(f.channel_groups, f.channel_groups)
+
+    def test_names_copy(self):
+        with open_sample(samples.bxr, "r") as f:
+            f.get_channel_group_names().append("Group 2")
+            self.assertEqual(["Group 1"], f.get_channel_group_names())
+            self.assertRaises(KeyError, f.get_channel_group, "Group 2")
+
+    def test_invalidate(self):
+        with open_sample(samples.bxr, "r") as f:
+            group = f.get_channel_group(0)
+            f.invalidate_metadata()
+            self.assertIsNot(group, f.get_channel_group(0))
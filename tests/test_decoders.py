@@ -0,0 +1,108 @@
+import os
+import struct
+import unittest
+from unittest import mock
+import h5py
+import numpy as np
+import bwpy
+from bwpy import _decoders
+from helpers import SyntheticBRWTestCase
+
+
+def write_sparse(path, raw, segments, chunk_frames, midpoint):
+    """
+    Replace the raw data of the BRW file at `path` by an events-based sparse stream of
+    the `segments` of `raw`, given per raw column as lists of ``(first, stop)`` frames.
+    """
+    n_frames = len(raw)
+    data, offsets, toc = bytearray(), [], []
+    for c0 in range(0, n_frames, chunk_frames):
+        c1 = min(c0 + chunk_frames, n_frames)
+        offsets.append(len(data))
+        toc.append((c0, c1))
+        for column, spans in segments.items():
+            chunk = bytearray()
+            for lo, hi in spans:
+                lo, hi = max(lo, c0), min(hi, c1)
+                if lo < hi:
+                    samples = raw[lo:hi, column].astype(np.int32) - midpoint
+                    chunk += struct.pack("<qq", lo, hi) + samples.astype("<i2").tobytes()
+            if chunk:
+                data += struct.pack("<ii", column, len(chunk)) + chunk
+    with h5py.File(path, "r+") as f:
+        group = f["3BData"]
+        del group["Raw"]
+        group.create_dataset(_decoders.SPARSE_DATA, data=np.frombuffer(data, np.int8))
+        group.create_dataset(_decoders.SPARSE_OFFSETS, data=np.array(offsets, np.int64))
+        group.create_dataset(_decoders.SPARSE_FRAMES, data=np.array(toc, np.int64))
+
+
+class TestSparseRaw(SyntheticBRWTestCase):
+    def setUp(self):
+        super().setUp()
+        self.file.close()
+        self.midpoint = 2 ** (12 - 1)
+        # On the 8x8 synthetic chip, the linear layout index is the raw column.
+        segments = {3: [(0, 30), (50, 51)], 10: [(25, 190)], 63: [(120, 200)]}
+        write_sparse(self.path, self.raw, segments, 64, self.midpoint)
+        self.dense = np.full_like(self.raw, self.midpoint)
+        for column, spans in segments.items():
+            for lo, hi in spans:
+                self.dense[lo:hi, column] = self.raw[lo:hi, column]
+        self.file = bwpy.File(self.path, "r")
+
+    def test_raw(self):
+        self.assertIsInstance(self.file.raw, _decoders.SparseRaw)
+        self.assertEqual(200 * 64, len(self.file.raw))
+        self.assertTrue(np.array_equal(self.dense.reshape(-1), self.file.raw[:]))
+        self.assertTrue(
+            np.array_equal(
+                self.dense.reshape(-1)[1000:5000:3], self.file.raw[1000:5000:3]
+            )
+        )
+
+    def test_slices(self):
+        for t in (slice(None), slice(20, 60), slice(5, 190, 11), slice(199, 0, -2)):
+            with self.subTest(t=t):
+                data = self.file.t[t].ch[:2, :].read(convert=False)
+                self.assertTrue(np.array_equal(self.dense[t, :16].T, data))
+        data = self.file.t[100:].ch[7, 7].data
+        self.assertTrue(np.allclose(self.file.convert(self.dense[100:, 63]), data[0]))
+
+    def test_streaming(self):
+        blocks = list(self.file.iter_chunks(frames_per_chunk=45, convert=False))
+        self.assertTrue(np.array_equal(self.dense.T, np.concatenate(blocks, axis=1)))
+        self.assertEqual(self.dense.max(), self.file.stats().max.max())
+
+    def test_cache(self):
+        with bwpy.File(self.path, "r", cache_size=2**20) as f:
+            self.assertTrue(
+                np.array_equal(self.dense[::3].T, f.t[::3].read(convert=False))
+            )
+
+    def test_stepped(self):
+        raw = self.file.raw
+        with mock.patch.object(_decoders, "READ_SIZE", 100):
+            for frames in (range(200), range(5, 200, 3), range(7, 200, 70), range(0)):
+                with self.subTest(frames=frames):
+                    block = raw.read_frames(frames)
+                    self.assertEqual((len(frames), 64), block.shape)
+                    self.assertTrue(np.array_equal(self.dense[list(frames)], block))
+
+    def test_selected_chunks(self):
+        # Frames 10 and 140 are in the 1st and 3rd chunk of 64 frames.
+        raw = self.file.raw
+        reads = []
+        data = raw._data
+        raw._data = mock.MagicMock()
+        raw._data.__getitem__.side_effect = lambda key: reads.append(key) or data[key]
+        block = raw.read_frames(range(10, 200, 130))
+        self.assertTrue(np.array_equal(self.dense[10:200:130], block))
+        offsets = raw._offsets
+        self.assertEqual(
+            [slice(offsets[0], offsets[1]), slice(offsets[2], offsets[3])], reads
+        )
+
+    def test_unaligned(self):
+        buffer = np.frombuffer(b"\x00\x01\x02\xff\xff", np.uint8)
+        self.assertEqual([513, -1], _decoders._read(buffer, [1, 3], "<i2").tolist())
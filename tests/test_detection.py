@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+import h5py
+import numpy as np
+import bwpy
+from helpers import create_brw
+
+try:
+    import scipy
+except ImportError:
+    scipy = None
+
+
+@unittest.skipIf(scipy is None, "SciPy is required for filtering.")
+class TestSpikeDetection(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "spikes.brw")
+        create_brw(self.path, 6000, shape=(4, 4))
+        rng = np.random.default_rng(1)
+        data = rng.normal(2048, 8, (6000, 16))
+        self.spikes = [(500, 3), (1203, 3), (1210, 3), (2500, 7), (4990, 0), (5001, 12)]
+        for frame, ch in self.spikes:
+            data[frame : frame + 10, ch] -= 100 * np.hanning(10)
+        with h5py.File(self.path, "r+") as f:
+            f["3BData/Raw"][()] = data.astype(np.uint16).reshape(-1)
+        self.file = bwpy.File(self.path, "r")
+
+    def tearDown(self):
+        self.file.close()
+        self._dir.cleanup()
+
+    def assertDetected(self, expected, spikes):
+        self.assertEqual(len(expected), len(spikes))
+        for (frame, ch), time, id in zip(expected, spikes.times, spikes.channels):
+            self.assertEqual(ch, id)
+            self.assertLessEqual(abs(frame + 3 - time), 3)
+
+    def test_detect(self):
+        spikes = self.file.detect_spikes(frames_per_chunk=1000)
+        self.assertIsInstance(spikes, bwpy.Spikes)
+        self.assertDetected([s for s in self.spikes if s[0] != 1210], spikes)
+
+    def test_no_dead_time(self):
+        spikes = self.file.detect_spikes(dead_time=0, frames_per_chunk=1000)
+        self.assertDetected(self.spikes, spikes)
+
+    def test_chunk_independence(self):
+        a = self.file.detect_spikes(frames_per_chunk=997)
+        b = self.file.detect_spikes(frames_per_chunk=3000)
+        self.assertTrue(np.array_equal(a.channels, b.channels))
+        self.assertTrue(np.all(np.abs(a.times - b.times) <= 1))
+        # The noise is estimated once, so tiny blocks find the same spikes.
+        c = self.file.detect_spikes(frames_per_chunk=50)
+        self.assertTrue(np.array_equal(a.channels, c.channels))
+        self.assertTrue(np.all(np.abs(a.times - c.times) <= 1))
+
+    def test_dead_time(self):
+        rng = np.random.default_rng(2)
+        blocks = [rng.normal(0, 1, (5, n)) for n in (40, 3, 100, 57)]
+        blocks = [np.where(rng.random(b.shape) < 0.3, -10, b) for b in blocks]
+        detector = bwpy._detection.ThresholdDetector(5, threshold=3, dead_time=4)
+        detector.estimate_noise(np.ones((5, 1)))
+        reference = bwpy._detection.ThresholdDetector(5, threshold=3)
+        reference.estimate_noise(np.ones((5, 1)))
+        last = [-100] * 5
+        offset = 0
+        for block in blocks:
+            expected = []
+            for ch, pos in zip(*reference(block, offset)):
+                if pos + offset - last[ch] >= 4:
+                    last[ch] = pos + offset
+                    expected.append((ch, pos))
+            self.assertEqual(expected, list(zip(*map(list, detector(block, offset)))))
+            offset += block.shape[1]
+
+    def test_channel_slice(self):
+        spikes = self.file.t[1000:].ch[0:2, :].detect_spikes()
+        self.assertDetected([(1203, 3), (2500, 7), (4990, 0)], spikes)
+
+    def test_workers(self):
+        serial = self.file.detect_spikes()
+        parallel = self.file.detect_spikes(workers=3)
+        self.assertTrue(np.array_equal(serial.times, parallel.times))
+        self.assertTrue(np.array_equal(serial.channels, parallel.channels))
+
+    def test_iter_detect(self):
+        tables = list(self.file.iter_detect_spikes(frames_per_chunk=1500))
+        self.assertEqual(4, len(tables))
+        self.assertEqual(5, sum(len(t) for t in tables))
+
+    def test_iter_filtered(self):
+        blocks = list(self.file.iter_filtered(300, 3000, frames_per_chunk=2500))
+        self.assertEqual([2500, 2500, 1000], [b.shape[1] for b in blocks])
+        self.assertEqual(np.float32, blocks[0].dtype)
+        # The filter removes the DC offset of the signal.
+        self.assertLess(abs(np.concatenate(blocks, axis=1)[:, 100:].mean()), 1)
+
+
+@unittest.skipIf(scipy is None, "SciPy is required for filtering.")
+class TestDecimation(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "lfp.brw")
+        create_brw(self.path, 5000, shape=(2, 2))
+        self.file = bwpy.File(self.path, "r")
+
+    def tearDown(self):
+        self.file.close()
+        self._dir.cleanup()
+
+    def expected(self, slice, factor):
+        import scipy.signal
+
+        data = slice.data
+        sos = scipy.signal.cheby1(8, 0.05, 0.8 / factor, output="sos")
+        zi = scipy.signal.sosfilt_zi(sos)[:, None, :] * data[None, :, :1]
+        return scipy.signal.sosfilt(sos, data, zi=zi)[0][:, ::factor]
+
+    def test_decimate(self):
+        data = self.file.decimate(10, dtype=np.float64)
+        self.assertEqual((4, 500), data.shape)
+        self.assertTrue(np.allclose(self.expected(self.file, 10), data))
+
+    def test_chunk_independence(self):
+        for frames_per_chunk in (7, 100, 4999):
+            with self.subTest(frames_per_chunk=frames_per_chunk):
+                data = (
+                    self.file.t[3:4900]
+                    .ch[0, :]
+                    .decimate(6, frames_per_chunk=frames_per_chunk, dtype=np.float64)
+                )
+                expected = self.expected(self.file.t[3:4900].ch[0, :], 6)
+                self.assertEqual(expected.shape, data.shape)
+                self.assertTrue(np.allclose(expected, data))
+
+    def test_iter_decimated(self):
+        blocks = list(self.file.iter_decimated(4, frames_per_chunk=1001))
+        self.assertEqual([251, 250, 250, 250, 249], [b.shape[1] for b in blocks])
+        self.assertEqual(np.float32, blocks[0].dtype)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.file.decimate(2.5)
+        with self.assertRaises(ValueError):
+            self.file.t[::-1].decimate(2)
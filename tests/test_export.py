@@ -0,0 +1,138 @@
+import os
+import unittest
+import h5py
+import numpy as np
+import bwpy
+from helpers import SyntheticBRWTestCase
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+
+class TestExport(SyntheticBRWTestCase):
+    def target(self, name):
+        return os.path.join(self._dir.name, name)
+
+    def test_raw(self):
+        path = self.target("synthetic.bin")
+        self.file.t[10:150].export(path, frames_per_chunk=16)
+        data = np.fromfile(path, dtype=np.uint16).reshape(140, 64)
+        self.assertTrue(np.array_equal(self.raw[10:150], data))
+
+    def test_int16(self):
+        path = self.target("synthetic.dat")
+        self.file.export(path, dtype=np.int16)
+        data = np.fromfile(path, dtype=np.int16).reshape(200, 64)
+        # The 12 bit ADC values are centered on 2048.
+        self.assertTrue(np.array_equal(self.raw.astype(np.int32) - 2048, data))
+
+    def test_npy(self):
+        path = self.target("synthetic.npy")
+        self.file.t[::3].ch[2:5, 1:7].export(path, frames_per_chunk=7)
+        data = np.load(path)
+        grid = np.arange(64).reshape(8, 8)[2:5, 1:7].reshape(-1)
+        expected = self.raw[::3][:, grid]
+        self.assertEqual(expected.shape, data.shape)
+        self.assertTrue(np.array_equal(expected, data))
+
+    def test_convert(self):
+        path = self.target("synthetic.npy")
+        self.file.ch[3, :].export(path, dtype=np.float32, convert=True)
+        data = np.load(path)
+        self.assertEqual(np.float32, data.dtype)
+        self.assertTrue(np.allclose(self.file.ch[3, :].data.T, data))
+
+    def test_hdf5(self):
+        path = self.target("synthetic.h5")
+        self.file.t[::2].export(path, compression="gzip")
+        with h5py.File(path, "r") as f:
+            data = f["data"]
+            self.assertEqual("gzip", data.compression)
+            self.assertTrue(np.array_equal(self.raw[::2], data[()]))
+            self.assertEqual(self.file.sampling_rate / 2, data.attrs["SamplingRate"])
+            self.assertTrue(
+                np.allclose(self.file.convert(data[:5]), self.file.t[:10:2].data.T)
+            )
+            converted = data[:5] * data.attrs["StepV"] + data.attrs["VOffset"]
+            self.assertTrue(np.allclose(converted, self.file.t[:10:2].data.T))
+
+    @unittest.skipIf(zarr is None, "Zarr is not installed.")
+    def test_zarr(self):
+        path = self.target("synthetic.zarr")
+        self.file.ch[:4, :].export(path, dtype=np.int16)
+        data = zarr.open_array(path, mode="r")
+        self.assertTrue(np.array_equal(self.raw[:, :32].astype(int) - 2048, data[()]))
+        converted = data[()] * data.attrs["StepV"] + data.attrs["VOffset"]
+        self.assertTrue(np.allclose(converted, self.file.ch[:4, :].data.T))
+
+    def test_convert_integer(self):
+        with self.assertRaises(ValueError):
+            self.file.export(self.target("synthetic.npy"), dtype=np.int16, convert=True)
+
+    def test_empty(self):
+        for selection, shape in (
+            (self.file.t[10:10], (0, 64)),
+            (self.file.ch[0:0], (200, 0)),
+        ):
+            for name in ("empty.h5", "empty.npy"):
+                with self.subTest(shape=shape, name=name):
+                    path = self.target(name)
+                    selection.export(path)
+                    if name.endswith(".h5"):
+                        with h5py.File(path, "r") as f:
+                            self.assertEqual(shape, f["data"].shape)
+                    else:
+                        self.assertEqual(shape, np.load(path).shape)
+
+    def test_storage_options(self):
+        with self.assertRaises(TypeError):
+            self.file.export(self.target("synthetic.npy"), compression="gzip")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.file.export(self.target("synthetic.bin"), format="csv")
+
+
+class TestWriteBRW(SyntheticBRWTestCase):
+    def test_write(self):
+        path = os.path.join(self._dir.name, "written.brw")
+        self.file.t[20:180:2].ch[1:3, 4:].write_brw(
+            path, chunk_frames=10, compression="gzip", shuffle=True
+        )
+        grid = np.arange(64).reshape(8, 8)[1:3, 4:].reshape(-1)
+        with bwpy.File(path, "r") as f:
+            self.assertIsInstance(f, bwpy.BRWFile)
+            self.assertNotEqual(self.file.guid, f.guid)
+            self.assertEqual(80, f.n_frames)
+            self.assertEqual(self.file.sampling_rate / 2, f.sampling_rate)
+            self.assertEqual(8, f.n_channels)
+            self.assertEqual((8, 80), f.ch[1:3, 4:].read(convert=False).shape)
+            self.assertEqual((8 * 10,), f.raw.chunks)
+            self.assertEqual("gzip", f.raw.compression)
+            self.assertTrue(
+                np.array_equal(self.raw[20:180:2][:, grid], f.read(convert=False).T)
+            )
+            self.assertTrue(
+                np.array_equal(self.file.t[20:180:2].ch[1:3, 4:].data, f.data)
+            )
+            self.assertTrue(
+                np.array_equal(
+                    self.file.get_raw_user_info()["ExpNotes"],
+                    f.get_raw_user_info()["ExpNotes"],
+                )
+            )
+
+    def test_empty(self):
+        path = os.path.join(self._dir.name, "written.brw")
+        for selection, frames, channels in (
+            (self.file.t[10:10], 0, 64),
+            (self.file.ch[0:0], 200, 0),
+        ):
+            with self.subTest(frames=frames, channels=channels):
+                selection.write_brw(path, compression="gzip")
+                with bwpy.File(path, "r") as f:
+                    self.assertEqual(frames, f.n_frames)
+                    self.assertEqual(channels, f.n_channels)
+                    self.assertEqual((0,), f.raw.shape)
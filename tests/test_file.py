@@ -117,3 +117,26 @@ class TestUserInfo(unittest.TestCase):
         with open_sample(samples.bxr, "r") as f:
             raw = f.get_raw_user_info()
             self.assertIsNotNone(raw)
+
+    def test_recording_variables_snapshot(self):
+        with open_sample(samples.brw, "r") as f:
+            rec_vars = f.recording_variables
+            self.assertIs(rec_vars, f.recording_variables)
+            self.assertIs(int, type(rec_vars.n_frames))
+            self.assertEqual(109783, rec_vars.n_frames)
+            self.assertEqual(12, rec_vars.variables["BitDepth"])
+            with self.assertRaises(AttributeError):
+                rec_vars.n_frames = 5
+            with self.assertRaises(TypeError):
+                rec_vars.variables["NRecFrames"] = 5
+
+    def test_invalidate_metadata(self):
+        with open_sample_copy(samples.brw) as f:
+            self.assertEqual(109783, f.n_frames)
+            f["3BRecInfo/3BRecVars/NRecFrames"][0] = 5
+            self.assertEqual(109783, f.n_frames)
+            f.invalidate_metadata()
+            self.assertEqual(5, f.n_frames)
+            f["3BRecInfo/3BRecVars/NRecFrames"][0] = 10
+            f.description = "BRW-File Level3 - Hi, I'm Elfo"
+            self.assertEqual(10, f.n_frames)
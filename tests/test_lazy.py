@@ -0,0 +1,97 @@
+import gc
+import os
+import pickle
+import unittest
+import numpy as np
+import bwpy
+from bwpy import _reader
+from helpers import SyntheticBRWTestCase, create_brw
+
+try:
+    import dask.array
+except ImportError:
+    dask = None
+
+
+class TestLazyArray(SyntheticBRWTestCase):
+    def test_array(self):
+        lazy = self.file.t[10:150].ch[2:4, :].lazy()
+        self.assertEqual((16, 140), lazy.shape)
+        self.assertEqual(np.float64, lazy.dtype)
+        self.assertEqual(16, len(lazy))
+        data = self.file.t[10:150].ch[2:4, :].data
+        self.assertTrue(np.array_equal(data, np.asarray(lazy)))
+        self.assertTrue(np.allclose(data.mean(axis=1), np.mean(lazy, axis=1)))
+
+    def test_indexing(self):
+        lazy = self.file.t[::-2].lazy(convert=False)
+        data = self.file.t[::-2].read(convert=False)
+        keys = [
+            (slice(3, 9), slice(10, 40, 3)),
+            5,
+            (5, 7),
+            (slice(None), -1),
+            ([4, 1, 60], slice(None, None, -5)),
+            (Ellipsis, slice(90, 95)),
+            (slice(0, 2), [7, 3, 3, 50]),
+            (slice(2), slice(50, 10)),
+        ]
+        for key in keys:
+            with self.subTest(key=key):
+                expected = data[key]
+                self.assertEqual(expected.shape, np.shape(lazy[key]))
+                self.assertTrue(np.array_equal(expected, lazy[key]))
+        with self.assertRaises(IndexError):
+            lazy[0, 0, 0]
+
+    def test_pickle(self):
+        lazy = pickle.loads(
+            pickle.dumps(self.file.t[5:20].ch[1, :].lazy(dtype=np.float32))
+        )
+        self.assertEqual(np.float32, lazy.dtype)
+        self.assertTrue(np.allclose(self.file.t[5:20].ch[1, :].data, np.asarray(lazy)))
+        # Unpickled arrays share a pooled handle, that they release when collected.
+        pool = bwpy.get_file_pool()
+        other = pickle.loads(pickle.dumps(lazy))
+        file = lazy._slice._file
+        self.assertIs(file, other._slice._file)
+        del lazy, other
+        gc.collect()
+        pool.clear()
+        self.assertFalse(file)
+
+    def test_no_copy(self):
+        lazy = self.file.lazy()
+        with self.assertRaises(ValueError):
+            np.array(lazy, copy=False)
+        self.assertEqual(np.float32, np.asarray(lazy, dtype=np.float32).dtype)
+
+    def test_chunks(self):
+        path = os.path.join(self._dir.name, "chunked.brw")
+        # Raw chunks of 96 values hold 1.5 frames of 64 channels, so the chunks and
+        # frames line up every 3 frames.
+        create_brw(path, 200, shape=(8, 8), chunks=(96,))
+        old = _reader.BLOCK_SIZE
+        # Blocks of 7 frames, rounded down to 6 to hold whole chunks.
+        _reader.BLOCK_SIZE = 7 * 64 * 2
+        try:
+            with bwpy.File(path, "r") as f:
+                self.assertEqual(((64,), (6,) * 33 + (2,)), f.lazy().chunks)
+                self.assertEqual((5,) + (6,) * 32 + (2,), f.t[1:].lazy().chunks[1])
+                self.assertEqual((2,) + (6,) * 33, f.t[::-1].lazy().chunks[1])
+                self.assertEqual((2, 3, 3, 3, 1), f.t[3:27:2].ch[0, :].lazy().chunks[1])
+        finally:
+            _reader.BLOCK_SIZE = old
+
+
+@unittest.skipIf(dask is None, "Dask is not installed.")
+class TestDask(SyntheticBRWTestCase):
+    def test_dask(self):
+        array = self.file.t[3:170].ch[::2, 1:5].to_dask(convert=False)
+        self.assertIsInstance(array, dask.array.Array)
+        expected = self.file.t[3:170].ch[::2, 1:5].read(convert=False)
+        self.assertTrue(np.array_equal(expected, array.compute()))
+        self.assertTrue(np.allclose(expected.std(axis=1), array.std(axis=1).compute()))
+        self.assertEqual(
+            self.file.t[3:170].ch[::2, 1:5].to_dask(convert=False).name, array.name
+        )
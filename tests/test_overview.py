@@ -0,0 +1,83 @@
+import os
+import unittest
+import numpy as np
+import bwpy
+from helpers import SyntheticBRWTestCase
+
+
+class TestStats(SyntheticBRWTestCase):
+    def test_stats(self):
+        stats = self.file.t[10:190].ch[2:4, :].stats()
+        raw = self.raw[10:190, 16:32].astype(float)
+        self.assertIsInstance(stats, bwpy.ChannelStats)
+        self.assertEqual(np.uint16, stats.min.dtype)
+        self.assertTrue(np.array_equal(raw.min(axis=0), stats.min))
+        self.assertTrue(np.array_equal(raw.max(axis=0), stats.max))
+        self.assertTrue(np.allclose(raw.mean(axis=0), stats.mean))
+        self.assertTrue(np.allclose(raw.std(axis=0), stats.std))
+
+    def test_binned_stats(self):
+        stats = self.file.t[::2].ch[5, 5].stats(bin_frames=30)
+        raw = self.raw[::2, 45].astype(float)
+        self.assertEqual((1, 4), stats.mean.shape)
+        bins = [raw[i : i + 30] for i in range(0, 100, 30)]
+        self.assertTrue(np.array_equal([b.min() for b in bins], stats.min[0]))
+        self.assertTrue(np.array_equal([b.max() for b in bins], stats.max[0]))
+        self.assertTrue(np.allclose([b.mean() for b in bins], stats.mean[0]))
+        self.assertTrue(np.allclose([b.std() for b in bins], stats.std[0]))
+        with self.assertRaises(ValueError):
+            self.file.stats(bin_frames=0)
+
+    def test_converted_stats(self):
+        stats = self.file.ch[0, :].stats(convert=True)
+        data = self.file.ch[0, :].data
+        self.assertTrue(np.allclose(data.min(axis=1), stats.min))
+        self.assertTrue(np.allclose(data.max(axis=1), stats.max))
+        self.assertTrue(np.allclose(data.mean(axis=1), stats.mean))
+        self.assertTrue(np.allclose(data.std(axis=1), stats.std))
+
+
+class TestOverview(SyntheticBRWTestCase):
+    def check_overview(self, overview):
+        self.assertEqual([8, 24, 72, 216], overview.bin_frames)
+        self.assertEqual(200, overview.n_frames)
+        for level, size in enumerate(overview.bin_frames):
+            bins = range(0, 200, size)
+            lo = np.array([self.raw[b : b + size].min(axis=0) for b in bins]).T
+            hi = np.array([self.raw[b : b + size].max(axis=0) for b in bins]).T
+            self.assertTrue(np.array_equal(lo, overview.min(level)[()]))
+            self.assertTrue(np.array_equal(hi, overview.max(level)[()]))
+        self.assertEqual(1, overview.get_level(50))
+        self.assertEqual(0, overview.get_level(1))
+
+    def test_sidecar(self):
+        path = os.path.join(self._dir.name, "synthetic.overview.h5")
+        self.assertIsNone(self.file.get_overview(path))
+        self.file.build_overview(path, bin_frames=8, factor=3)
+        self.check_overview(self.file.get_overview(path))
+        # The sidecar is opened once, and can still be rebuilt.
+        first, second = self.file.get_overview(path), self.file.get_overview(path)
+        self.assertEqual(first._group.file.id.id, second._group.file.id.id)
+        self.file.build_overview(path, bin_frames=8, factor=3)
+        self.check_overview(self.file.get_overview(path))
+        self.assertEqual(1, len(self.file._sidecars))
+
+    def test_in_file(self):
+        with self.assertRaises(RuntimeError):
+            self.file.build_overview()
+        self.assertIsNone(self.file.get_overview())
+        self.file.close()
+        with bwpy.File(self.path, "r+") as f:
+            f.build_overview(bin_frames=8, factor=3)
+        self.file = bwpy.File(self.path, "r")
+        self.check_overview(self.file.get_overview())
+
+    def test_wrong_file(self):
+        path = os.path.join(self._dir.name, "synthetic.overview.h5")
+        self.file.build_overview(path)
+        self.file.close()
+        with bwpy.File(self.path, "r+") as f:
+            f.attrs["GUID"] = np.bytes_("other")
+        self.file = bwpy.File(self.path, "r")
+        with self.assertRaises(ValueError):
+            self.file.get_overview(path)
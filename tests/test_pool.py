@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+import numpy as np
+import bwpy
+from helpers import SyntheticBRWTestCase, create_brw, get_sample_path, samples
+
+
+class TestFilePool(SyntheticBRWTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = bwpy.FilePool(maxsize=2)
+
+    def tearDown(self):
+        self.pool.clear()
+        super().tearDown()
+
+    def test_reuse(self):
+        with self.pool.open(self.path) as f:
+            self.assertIsInstance(f, bwpy.BRWFile)
+            self.assertTrue(np.array_equal(self.file.data, f.data))
+        with self.pool.open(self.path) as g:
+            self.assertIs(f, g)
+            self.assertTrue(g)
+        self.assertEqual((1, 1, 2, 1), tuple(self.pool.info()))
+
+    def test_options(self):
+        with self.pool.open(self.path) as f, self.pool.open(self.path, mmap=True) as g:
+            self.assertIsNot(f, g)
+            self.assertTrue(np.array_equal(f.data, g.data))
+
+    def test_modified(self):
+        with self.pool.open(self.path) as f:
+            pass
+        os.utime(self.path, ns=(0, 0))
+        with self.pool.open(self.path) as g:
+            self.assertIsNot(f, g)
+        self.assertFalse(f)
+        self.assertEqual(1, self.pool.info().currsize)
+
+    def test_eviction(self):
+        paths = [os.path.join(self._dir.name, f"{i}.brw") for i in range(3)]
+        handles = []
+        for path in paths:
+            create_brw(path, 10, shape=(2, 2))
+            with self.pool.open(path) as f:
+                handles.append(f)
+        self.assertEqual([False, True, True], [bool(f) for f in handles])
+        self.assertEqual(2, self.pool.info().currsize)
+
+    def test_in_use(self):
+        with self.pool.open(self.path) as f:
+            self.pool.clear()
+            self.assertTrue(f)
+            self.assertEqual(0, self.pool.info().currsize)
+        self.assertFalse(f)
+
+    def test_closed_by_user(self):
+        with self.pool.open(self.path) as f:
+            f.close()
+        with self.pool.open(self.path) as g:
+            self.assertIsNot(f, g)
+            self.assertTrue(g)
+
+    def test_slow_open(self):
+        slow = os.path.join(self._dir.name, "slow.brw")
+        create_brw(slow, 10, shape=(2, 2))
+        opened = threading.Event()
+        calls = []
+
+        def open_file(path, *args, **kwargs):
+            calls.append(path)
+            if path.endswith("slow.brw"):
+                opened.set()
+                time.sleep(0.5)
+            return File(path, *args, **kwargs)
+
+        def borrow():
+            with self.pool.open(slow) as f:
+                handles.append(f)
+
+        File = bwpy.File
+        handles = []
+        with self.pool.open(self.path):
+            pass
+        with mock.patch.object(bwpy, "File", open_file):
+            threads = [threading.Thread(target=borrow) for _ in range(2)]
+            threads[0].start()
+            opened.wait()
+            threads[1].start()
+            # Files that are already open can be borrowed while another file opens.
+            start = time.perf_counter()
+            with self.pool.open(self.path):
+                self.assertLess(time.perf_counter() - start, 0.25)
+            for thread in threads:
+                thread.join()
+        self.assertEqual(1, calls.count(os.path.realpath(slow)))
+        self.assertIs(handles[0], handles[1])
+
+    def test_failed_open(self):
+        with mock.patch.object(bwpy, "File", side_effect=OSError("unreadable")):
+            with self.assertRaises(OSError):
+                with self.pool.open(self.path):
+                    pass
+        self.assertEqual(0, self.pool.info().currsize)
+        with self.pool.open(self.path) as f:
+            self.assertTrue(f)
+
+    def test_no_fork(self):
+        # Platforms without `fork`, such as Windows, have no fork handlers.
+        names = [name for name in dir(os) if name != "register_at_fork"]
+        with mock.patch("bwpy._pool.os", mock.Mock(spec=names, wraps=os)):
+            pool = bwpy.FilePool()
+        with pool.open(self.path) as f:
+            self.assertTrue(f)
+        pool.clear()
+
+    def test_bxr(self):
+        with bwpy.pooled(get_sample_path(samples.bxr)) as f:
+            self.assertIsInstance(f, bwpy.BXRFile)
+        self.assertIs(bwpy.get_file_pool(), bwpy.get_file_pool())
+        bwpy.get_file_pool().clear()
+        self.assertFalse(f)
@@ -0,0 +1,350 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import bwpy
+from bwpy import _reader
+from helpers import SyntheticBRWTestCase, create_brw
+
+
+class TestReadEngine(SyntheticBRWTestCase):
+    def test_full_read(self):
+        self.assertTrue(np.allclose(self.expected(slice(None)), self.file.data))
+
+    def test_window_read(self):
+        data = self.file.t[20:50].ch[2:5, 3:].data
+        self.assertTrue(
+            np.allclose(self.expected(slice(20, 50), slice(2, 5), slice(3, None)), data)
+        )
+
+    def test_stepped_read(self):
+        for step in (2, _reader.MAX_SPAN_STEP + 3):
+            with self.subTest(step=step):
+                data = self.file.t[5:180:step].ch[1, 1].data
+                expected = self.expected(slice(5, 180, step), 1, 1)
+                self.assertTrue(np.allclose(expected, data))
+
+    def test_reversed_read(self):
+        data = self.file.t[150:10:-3].data
+        self.assertTrue(np.allclose(self.expected(slice(150, 10, -3)), data))
+
+    def test_multiple_blocks(self):
+        frames = range(3, 197, 2)
+        columns = np.array([5, 0, 63])
+        blocks = list(_reader.iter_blocks(self.file, frames, columns, length=7))
+        self.assertEqual(14, len(blocks))
+        data = np.concatenate([block for _, block in blocks])
+        self.assertTrue(np.array_equal(self.raw[3:197:2][:, columns], data))
+
+    def test_column_index(self):
+        self.assertEqual(slice(4, 8), _reader.column_index([4, 5, 6, 7]))
+        self.assertIsInstance(_reader.column_index([4, 6, 7]), np.ndarray)
+
+
+class TestIterChunks(SyntheticBRWTestCase):
+    def test_chunks(self):
+        chunks = list(self.file.iter_chunks(frames_per_chunk=30))
+        self.assertEqual([30] * 6 + [20], [c.shape[1] for c in chunks])
+        self.assertTrue(all(c.shape[0] == 64 for c in chunks))
+        self.assertTrue(np.allclose(self.file.data, np.concatenate(chunks, axis=1)))
+
+    def test_chained_chunks(self):
+        s = self.file.t[10:150].ch[2:4, 1:7].t[::3]
+        chunks = list(s.iter_chunks(frames_per_chunk=8))
+        self.assertEqual(6, len(chunks))
+        self.assertTrue(np.allclose(s.data, np.concatenate(chunks, axis=1)))
+
+    def test_default_chunks(self):
+        chunks = list(self.file.t[:20].iter_chunks())
+        self.assertEqual(1, len(chunks))
+        self.assertEqual((64, 20), chunks[0].shape)
+
+    def test_invalid_chunks(self):
+        with self.assertRaises(ValueError):
+            next(self.file.iter_chunks(frames_per_chunk=0))
+
+
+class TestMemoryMap(SyntheticBRWTestCase):
+    def test_mapped_read(self):
+        with bwpy.File(self.path, "r", mmap=True) as f:
+            self.assertIsInstance(f.raw, np.memmap)
+            self.assertTrue(np.array_equal(self.file.raw[()], f.raw))
+            self.assertTrue(np.allclose(self.file.data, f.data))
+            s = f.t[3:190:11].ch[2:6, 1]
+            self.assertTrue(
+                np.allclose(self.expected(slice(3, 190, 11), slice(2, 6), 1), s.data)
+            )
+
+    def test_unmapped_by_default(self):
+        self.assertNotIsInstance(self.file.raw, np.ndarray)
+
+    def test_chunked_fallback(self):
+        path = os.path.join(self._dir.name, "chunked.brw")
+        create_brw(path, 50, shape=(8, 8), chunks=(64,), compression="gzip")
+        with bwpy.File(path, "r", mmap=True) as f:
+            self.assertNotIsInstance(f.raw, np.ndarray)
+            self.assertEqual((64, 50), f.data.shape)
+
+    def test_memmap_output(self):
+        path = os.path.join(self._dir.name, "out.dat")
+        out = np.memmap(path, dtype=np.float32, mode="w+", shape=(64, 100))
+        self.assertIs(out, self.file.t[::2].read(workers=3, out=out))
+        self.assertTrue(np.allclose(self.expected(slice(None, None, 2)), out, atol=1e-3))
+
+    def test_temporary_output(self):
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        before = set(os.listdir(directory))
+        data = self.file.read(workers=2)
+        self.assertNotIsInstance(data, np.memmap)
+        self.assertTrue(np.array_equal(self.file.data, data))
+        self.assertEqual(before, set(os.listdir(directory)))
+
+    def test_in_memory_fallback(self):
+        with bwpy.File(self.path, "r", mmap=True, driver="core") as f:
+            self.assertNotIsInstance(f.raw, np.ndarray)
+            self.assertTrue(np.allclose(self.file.data, f.data))
+
+
+class TestConversion(SyntheticBRWTestCase):
+    def test_conversion_factors(self):
+        self.assertAlmostEqual(8250 / 4096, self.file.step_v)
+        self.assertAlmostEqual(-4125, self.file.v_offset)
+        self.assertAlmostEqual(-4125 + 100 * 8250 / 4096, self.file.convert(100))
+
+    def test_float32(self):
+        data = self.file.t[:50].read(dtype=np.float32)
+        self.assertEqual(np.float32, data.dtype)
+        self.assertTrue(np.allclose(self.expected(slice(50)), data, atol=1e-3))
+
+    def test_unconverted(self):
+        data = self.file.t[10:20].ch[3, :].read(convert=False)
+        self.assertEqual(np.uint16, data.dtype)
+        self.assertTrue(np.array_equal(self.raw[10:20, 24:32].T, data))
+        chunk = next(self.file.ch[3, :].iter_chunks(convert=False))
+        self.assertEqual(np.uint16, chunk.dtype)
+        self.assertTrue(np.array_equal(self.raw[:, 24:32].T, chunk))
+
+    def test_preallocated(self):
+        out = np.zeros((64, 120), dtype=np.float32)
+        data = self.file.t[::2].ch[:, :].read(out=out[:, 10:110])
+        self.assertTrue(np.shares_memory(out, data))
+        self.assertTrue(np.allclose(self.expected(slice(None, None, 2)), data, atol=1e-3))
+        self.assertFalse(out[:, :10].any())
+        with self.assertRaises(ValueError):
+            self.file.read(out=out)
+
+    def test_chunk_dtype(self):
+        chunk = next(self.file.iter_chunks(dtype=np.float32))
+        self.assertEqual(np.float32, chunk.dtype)
+
+
+class TestChannelIndex(SyntheticBRWTestCase):
+    def setUp(self):
+        super().setUp()
+        self.partial_path = os.path.join(self._dir.name, "partial.brw")
+        self.partial_chs = [(3, 4), (1, 1), (8, 2), (3, 3), (5, 7)]
+        self.partial_raw = create_brw(
+            self.partial_path, 30, shape=(8, 8), channels=self.partial_chs
+        )
+
+    def test_full_layout(self):
+        index = self.file.channel_index
+        self.assertIs(index, self.file.channel_index)
+        self.assertEqual((8, 8), index.shape)
+        self.assertEqual(64, index.n_channels)
+        self.assertEqual(19, index.get_columns(3, 4))
+        self.assertEqual(
+            [-1, -1, -1, 0], list(index.get_columns([0, 9, 1, 1], [1, 1, 0, 1]))
+        )
+        rows, cols = index.get_positions([19, 63])
+        self.assertEqual([3, 8], list(rows))
+        self.assertEqual([4, 8], list(cols))
+
+    def test_partial_layout(self):
+        with bwpy.File(self.partial_path, "r") as f:
+            index = f.channel_index
+            self.assertEqual(5, index.n_channels)
+            self.assertEqual([0, 3, -1], list(index.get_columns([3, 3, 2], [4, 3, 2])))
+            self.assertEqual((5, 30), f.data.shape)
+            # Data rows follow the layout order of the selected, recorded positions.
+            order = [1, 3, 0, 4, 2]
+            self.assertTrue(np.allclose(f.convert(self.partial_raw[:, order].T), f.data))
+            self.assertTrue(
+                np.allclose(f.convert(self.partial_raw[:, 2]), f.ch[7, 1].data[0])
+            )
+            self.assertEqual((0, 30), f.ch[1, 1:].data.shape)
+            # The positions of a slice line up with its data rows.
+            s = f.ch[2:5, :]
+            self.assertEqual([(3, 3), (3, 4), (5, 7)], s.channels.tolist())
+            self.assertTrue(
+                np.allclose(f.convert(self.partial_raw[:, [3, 0, 4]].T), s.data)
+            )
+            self.assertEqual((8, 8), self.file.ch[:, :].channels.shape)
+
+
+class TestParallelRead(SyntheticBRWTestCase):
+    def test_parallel_read(self):
+        s = self.file.t[3:197:3].ch[2:7, 1:]
+        self.assertTrue(np.array_equal(s.data, s.read(workers=3)))
+
+    def test_parallel_options(self):
+        data = self.file.t[190:5:-2].read(workers=2, convert=False)
+        self.assertTrue(np.array_equal(self.raw[190:5:-2].T, data))
+        out = np.empty((64, 200), dtype=np.float32)
+        self.assertIs(out, self.file.read(workers=4, out=out))
+        self.assertTrue(np.allclose(self.expected(slice(None)), out, atol=1e-3))
+
+    def test_parallel_mapped(self):
+        with bwpy.File(self.path, "r", mmap=True) as f:
+            self.assertTrue(np.array_equal(self.file.data, f.read(workers=2)))
+
+    def test_memmap_output(self):
+        path = os.path.join(self._dir.name, "out.dat")
+        out = np.memmap(path, dtype=np.float32, mode="w+", shape=(64, 100))
+        self.assertIs(out, self.file.t[::2].read(workers=3, out=out))
+        self.assertTrue(np.allclose(self.expected(slice(None, None, 2)), out, atol=1e-3))
+
+    def test_temporary_output(self):
+        before = set(os.listdir(tempfile.gettempdir()))
+        data = self.file.read(workers=2)
+        self.assertNotIsInstance(data, np.memmap)
+        self.assertTrue(np.array_equal(self.file.data, data))
+        self.assertFalse(
+            any(
+                n.startswith("bwpy-")
+                for n in set(os.listdir(tempfile.gettempdir())) - before
+            )
+        )
+
+    def test_in_memory_fallback(self):
+        with bwpy.File(self.path, "r", driver="core") as f:
+            self.assertTrue(np.array_equal(self.file.data, f.read(workers=2)))
+
+
+class TestBlockCache(SyntheticBRWTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cached = bwpy.File(self.path, "r", cache_size=2**14)
+        # 8 frames of 64 channels per block, 16 blocks fit.
+        self.cached._cache.block_frames = 8
+
+    def tearDown(self):
+        self.cached.close()
+        super().tearDown()
+
+    def test_no_cache(self):
+        self.assertEqual((0, 0, 0, 0), tuple(self.file.cache_info()))
+
+    def test_cached_reads(self):
+        for t in (slice(3, 50), slice(3, 50), slice(7, 190, 5), slice(150, 9, -7)):
+            with self.subTest(t=t):
+                s = self.cached.t[t].ch[1:3, 2:6]
+                self.assertTrue(np.array_equal(self.file.t[t].ch[1:3, 2:6].data, s.data))
+
+    def test_hits_and_misses(self):
+        self.cached.t[3:50].data
+        self.assertEqual((0, 7, 2**14, 7 * 8 * 64 * 2), tuple(self.cached.cache_info()))
+        self.cached.t[10:60].data
+        info = self.cached.cache_info()
+        self.assertEqual((6, 8), (info.hits, info.misses))
+        self.cached.cache_clear()
+        self.assertEqual((0, 0, 2**14, 0), tuple(self.cached.cache_info()))
+
+    def test_eviction(self):
+        self.cached.data
+        info = self.cached.cache_info()
+        self.assertEqual(25, info.misses)
+        self.assertEqual(16 * 8 * 64 * 2, info.currsize)
+        # The first blocks were evicted, the last ones are still cached.
+        self.cached.t[190:].data
+        self.cached.t[:10].data
+        info = self.cached.cache_info()
+        self.assertEqual((2, 27), (info.hits, info.misses))
+
+
+class TestProfiling(SyntheticBRWTestCase):
+    def test_disabled(self):
+        self.file.data
+        self.assertEqual({}, self.file.profile_info())
+
+    def test_counters(self):
+        self.file.enable_profiling()
+        self.file.t[10:50].ch[1:3, :].data
+        self.file.t[:100:20].read(convert=False)
+        info = self.file.profile_info()
+        self.assertEqual(2, info["reads"])
+        self.assertEqual(45, info["frames"])
+        self.assertEqual(40 * 16 + 5 * 64, info["values"])
+        # One read of the selected columns of the window, frame by frame reads of all
+        # channels for the large step.
+        self.assertEqual(1 + 5, info["raw_reads"])
+        self.assertEqual((40 * 16 + 5 * 64) * 2, info["bytes_read"])
+        for key in ("read_time", "index_time", "io_time", "convert_time"):
+            self.assertGreater(info[key], 0)
+        self.assertLess(info["io_time"], info["read_time"])
+        self.file.profile_clear()
+        self.assertEqual(0, self.file.profile_info()["reads"])
+        self.file.disable_profiling()
+        self.assertEqual({}, self.file.profile_info())
+
+    def test_callback(self):
+        reports = []
+        self.file.enable_profiling(reports.append)
+        self.file.t[:10].data
+        self.file.t[:20].data
+        self.assertEqual([1, 1], [r["reads"] for r in reports])
+        self.assertEqual([10, 20], [r["frames"] for r in reports])
+
+    def test_cache(self):
+        with bwpy.File(self.path, "r", cache_size=2**20) as f:
+            f.enable_profiling()
+            f.t[:10].data
+            f.t[:10].data
+            info = f.profile_info()
+            self.assertEqual(
+                (1, 1, 1), (info["cache_hits"], info["cache_misses"], info["raw_reads"])
+            )
+
+
+class TestColumnRuns(SyntheticBRWTestCase):
+    def test_runs(self):
+        unique, runs = _reader.column_runs([9, 3, 4, 5, 20, 10, 4])
+        self.assertEqual([3, 4, 5, 9, 10, 20], unique.tolist())
+        self.assertEqual([(3, 6), (9, 11), (20, 21)], runs)
+        unique, runs = _reader.column_runs([])
+        self.assertEqual((0, []), (len(unique), runs))
+
+    def test_read_runs(self):
+        frames = range(5, 150, 3)
+        data = _reader.read_runs(self.file.raw, 64, frames, [(3, 6), (9, 11)], 5)
+        self.assertTrue(np.array_equal(self.raw[5:150:3][:, [3, 4, 5, 9, 10]], data))
+
+    def test_scattered_columns(self):
+        self.file.enable_profiling()
+        rows, cols = np.array([7, 0, 3, 3, 0]), np.array([1, 2, 5, 4, 3])
+        for t in (slice(None), slice(3, 190, 11), slice(180, 2, -3)):
+            with self.subTest(t=t):
+                self.file.profile_clear()
+                data = self.file.t[t].ch[rows, cols].read(convert=False)
+                expected = self.raw[t][:, rows * 8 + cols].T
+                self.assertTrue(np.array_equal(expected, data))
+                info = self.file.profile_info()
+                self.assertEqual(1, info["raw_reads"])
+                self.assertEqual(expected.size * 2, info["bytes_read"])
+
+    def test_many_runs(self):
+        # Columns scattered over more runs than `MAX_RUNS` are picked out of whole frames.
+        self.file.enable_profiling()
+        columns = np.arange(0, 64, 7)
+        data = self.file.ch[columns // 8, columns % 8].read(convert=False)
+        self.assertTrue(np.array_equal(self.raw[:, columns].T, data))
+        self.assertEqual(self.raw.nbytes, self.file.profile_info()["bytes_read"])
+
+    def test_chunked(self):
+        path = os.path.join(self._dir.name, "chunked.brw")
+        raw = create_brw(path, 50, shape=(8, 8), chunks=(64,))
+        with bwpy.File(path, "r") as f:
+            f.enable_profiling()
+            data = f.ch[2, 3:5].read(convert=False)
+            self.assertTrue(np.array_equal(raw[:, 19:21].T, data))
+            self.assertEqual(raw.nbytes, f.profile_info()["bytes_read"])
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from bwpy import _referencing
+from helpers import SyntheticBRWTestCase
+
+
+class TestNeighbourTable(unittest.TestCase):
+    def brute_force(self, rows, cols, k):
+        d = (rows[:, None] - rows) ** 2 + (cols[:, None] - cols) ** 2
+        np.fill_diagonal(d, np.iinfo(d.dtype).max)
+        # Nearest first, ties broken by row and then column, like the table.
+        return np.array([np.lexsort((cols, rows, dist))[:k] for dist in d])
+
+    def test_full_layout(self):
+        rows, cols = np.divmod(np.arange(100), 10)
+        table = _referencing.neighbour_table(rows, cols, 8)
+        self.assertTrue(np.array_equal(self.brute_force(rows, cols, 8), table))
+        # The corner has its 3 adjacent neighbours first.
+        self.assertEqual({1, 10, 11}, set(table[0, :3]))
+
+    def test_sparse_layout(self):
+        rng = np.random.default_rng(0)
+        positions = rng.choice(64 * 64, 300, replace=False)
+        rows, cols = np.divmod(positions, 64)
+        for k in (1, 5, 20):
+            with self.subTest(k=k):
+                table = _referencing.neighbour_table(rows, cols, k)
+                self.assertTrue(np.array_equal(self.brute_force(rows, cols, k), table))
+
+    def test_too_many(self):
+        with self.assertRaises(ValueError):
+            _referencing.neighbour_table([1, 2], [1, 1], 2)
+
+
+class TestRereference(SyntheticBRWTestCase):
+    def test_global(self):
+        data = self.file.t[:150].ch[2:6, :].data
+        out = self.file.t[:150].ch[2:6, :].rereference(dtype=np.float64)
+        self.assertTrue(np.allclose(data - data.mean(axis=0), out))
+
+    def test_median(self):
+        data = self.file.ch[:, 1:4].data
+        out = self.file.ch[:, 1:4].rereference("median", frames_per_chunk=33)
+        self.assertEqual(np.float32, out.dtype)
+        self.assertTrue(np.allclose(data - np.median(data, axis=0), out, atol=1e-5))
+
+    def test_knn(self):
+        data = self.file.data
+        out = self.file.rereference("knn", k=4, dtype=np.float64, frames_per_chunk=50)
+        rows, cols = np.divmod(np.arange(64), 8)
+        table = _referencing.neighbour_table(rows, cols, 4)
+        self.assertTrue(np.allclose(data - data[table].mean(axis=1), out))
+
+    def test_workers(self):
+        for mode in _referencing.MODES:
+            with self.subTest(mode=mode):
+                serial = self.file.t[::3].rereference(mode, k=6)
+                parallel = self.file.t[::3].rereference(mode, k=6, workers=3)
+                self.assertTrue(np.array_equal(serial, parallel))
+                blocks = list(self.file.iter_rereferenced(mode, frames_per_chunk=64))
+                self.assertEqual([64, 64, 64, 8], [b.shape[1] for b in blocks])
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.file.rereference("mean")
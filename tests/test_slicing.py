@@ -1,7 +1,9 @@
+import os
 import pathlib
 import unittest
 import bwpy
 import numpy as np
+from helpers import SyntheticBRWTestCase, create_brw, get_sample_path, samples
 
 path = pathlib.Path(__file__).parent
 
@@ -81,3 +83,88 @@ class TestFileObjects(unittest.TestCase):
         empty_slice = bwpy.File(f"{path}/test_samples/empty.brw", "r")
         with self.assertRaises(ValueError, "It should throw a ValueError") as context:
             empty_slice.t[:150].ch[:850, :].data
+
+
+class TestChannelSelection(SyntheticBRWTestCase):
+    def read_raw(self, slice):
+        return slice.read(convert=False)
+
+    def test_mask(self):
+        mask = np.zeros((8, 8), dtype=bool)
+        mask[[1, 5, 5, 7], [2, 0, 6, 7]] = True
+        data = self.read_raw(self.file.t[::2].ch[mask])
+        self.assertTrue(np.array_equal(self.raw[::2][:, [10, 40, 46, 63]].T, data))
+
+    def test_index_lists(self):
+        data = self.read_raw(self.file.ch[[6, 0, 3], [1, 7, 3]])
+        self.assertTrue(np.array_equal(self.raw[:, [49, 7, 27]].T, data))
+        data = self.read_raw(self.file.ch[[4, 1]].ch[:, 0])
+        self.assertTrue(np.array_equal(self.raw[:, [32, 8]].T, data))
+
+    def test_channel_group(self):
+        group = bwpy.ChannelGroup("group", [(8, 8), (1, 2), (3, 3), (9, 9)], None)
+        data = self.read_raw(self.file.t[10:20].ch[group])
+        # Positions outside of the chip are left out, the group order is kept.
+        self.assertTrue(np.array_equal(self.raw[10:20, [63, 1, 18]].T, data))
+        # Only the group positions in the current selection are kept.
+        data = self.read_raw(self.file.ch[2:, :].ch[group])
+        self.assertTrue(np.array_equal(self.raw[:, [63, 18]].T, data))
+
+    def test_channels(self):
+        channels = [bwpy.Channel(None, 2, 1), bwpy.Channel(None, 1, 1)]
+        data = self.read_raw(self.file.ch[channels])
+        self.assertTrue(np.array_equal(self.raw[:, [8, 0]].T, data))
+
+    def test_bxr_channel_group(self):
+        path = os.path.join(self._dir.name, "chip.brw")
+        raw = create_brw(path, 4)
+        with bwpy.File(get_sample_path(samples.bxr), "r") as bxr:
+            group = bxr.get_channel_groups()[0]
+        with bwpy.File(path, "r") as brw:
+            data = brw.ch[group].read(convert=False)
+        positions = group.positions
+        columns = (positions["Row"] - 1) * 64 + positions["Col"] - 1
+        self.assertEqual((len(group), 4), data.shape)
+        self.assertTrue(np.array_equal(raw[:, columns].T, data))
+
+
+class TestTimeSlicing(SyntheticBRWTestCase):
+    def test_composition(self):
+        frames = np.arange(200)
+        instructions = [
+            (slice(None, None, -1),),
+            (slice(10, 50), slice(None, None, -1)),
+            (slice(None, None, -1), slice(5, 10)),
+            (slice(None, None, 2), slice(None, None, -3)),
+            (slice(150, 20, -4), slice(3, None, 2), slice(None, None, -1)),
+            (slice(-30, None), -5),
+            (slice(None, None, -1), 0),
+            (slice(50, 10), slice(None, None, -1)),
+            (slice(None, None, -1), slice(200, None)),
+            (slice(None, None, -1), slice(300, None)),
+            (slice(None, None, -1), slice(None, 0)),
+            (slice(None, None, -1), slice(200, None), slice(None, None, -1)),
+            (slice(10, None, -2), slice(6, None), slice(None, None, 3)),
+        ]
+        for chain in instructions:
+            with self.subTest(chain=chain):
+                s, expected = self.file, frames
+                for instruction in chain:
+                    s = s.t[instruction]
+                    expected = np.atleast_1d(expected[instruction])
+                data = s.ch[0, 0].read(convert=False)[0]
+                self.assertEqual(expected.shape, data.shape)
+                self.assertTrue(np.array_equal(self.raw[expected, 0], data))
+
+    def test_seconds(self):
+        rate = self.file.sampling_rate
+        data = self.file.sec[0.001:0.005].ch[0, 0].read(convert=False)[0]
+        expected = self.raw[round(0.001 * rate) : round(0.005 * rate), 0]
+        self.assertTrue(np.array_equal(expected, data))
+        # Seconds are relative to the slice, at the rate of the slice.
+        data = self.file.t[10::2].sec[0.001].ch[0, 0].read(convert=False)[0]
+        self.assertTrue(
+            np.array_equal(self.raw[[10 + 2 * round(0.001 * rate / 2)], 0], data)
+        )
+        with self.assertRaises(ValueError):
+            self.file.sec[:: 0.1 / rate]
@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+import bwpy
+from bwpy import _spikes
+from helpers import open_sample, open_sample_copy, samples
+
+
+class TestSpikes(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.times = np.sort(rng.integers(0, 100000, 5000))
+        self.ids = rng.integers(0, 4096, 5000).astype(np.int32)
+        self.forms = rng.integers(-500, 500, (5000, 30)).astype(np.int16)
+        self.file = open_sample_copy(samples.bxr)
+        events = self.file["3BResults/3BChEvents"]
+        events.create_dataset("SpikeTimes", data=self.times)
+        events.create_dataset("SpikeChIDs", data=self.ids)
+        events.create_dataset("SpikeForms", data=self.forms.reshape(-1))
+
+    def tearDown(self):
+        self.file.close()
+
+    def test_all_spikes(self):
+        spikes = self.file.get_spikes()
+        self.assertIsInstance(spikes, bwpy.Spikes)
+        self.assertEqual(5000, len(spikes))
+        self.assertTrue(np.array_equal(self.times, spikes.times))
+        self.assertTrue(np.array_equal(self.ids, spikes.channels))
+        self.assertIsNone(spikes.waveforms)
+        self.assertIsNone(spikes.units)
+
+    def test_time_window(self):
+        spikes = self.file.get_spikes(20000, 30000, waveforms=True)
+        mask = (self.times >= 20000) & (self.times < 30000)
+        self.assertTrue(np.array_equal(self.times[mask], spikes.times))
+        self.assertTrue(np.array_equal(self.forms[mask], spikes.waveforms))
+
+    def test_channel_group(self):
+        group = self.file.get_channel_group(0)
+        spikes = self.file.get_spikes(stop=50000, channels=group)
+        ids = (group.positions["Row"] - 1) * 64 + group.positions["Col"] - 1
+        mask = np.isin(self.ids, ids) & (self.times < 50000)
+        self.assertTrue(np.array_equal(self.ids[mask], spikes.channels))
+        self.assertTrue(np.array_equal(self.times[mask], spikes.times))
+        spikes = self.file.get_spikes(channels=[5, 6])
+        self.assertTrue(
+            np.array_equal(self.times[np.isin(self.ids, [5, 6])], spikes.times)
+        )
+
+    def test_outside_layout(self):
+        # Positions off the 64x64 layout don't select any channel.
+        group = bwpy.ChannelGroup("Outside", [(0, 0), (65, 1), (1, 2)], [])
+        spikes = self.file.get_spikes(channels=group)
+        self.assertTrue(np.array_equal(self.times[self.ids == 1], spikes.times))
+        self.assertEqual(
+            [-1, -1, 1], list(self.file.channel_index.get_columns([0, 65, 1], [0, 1, 2]))
+        )
+
+    def test_iter_spikes(self):
+        chunks = list(self.file.iter_spikes(1000, 90000, waveforms=True, chunk_size=700))
+        self.assertTrue(all(len(c) <= 700 for c in chunks))
+        mask = (self.times >= 1000) & (self.times < 90000)
+        times = np.concatenate([c.times for c in chunks])
+        self.assertTrue(np.array_equal(self.times[mask], times))
+
+    def test_unsorted(self):
+        reader = _spikes._SpikeReader(
+            {"SpikeTimes": self.times[::-1], "SpikeChIDs": self.ids[::-1]}
+        )
+        self.assertFalse(reader.sorted)
+        spikes = reader.read(20000, 30000, None, False)
+        mask = (self.times >= 20000) & (self.times < 30000)
+        self.assertTrue(np.array_equal(self.times[mask][::-1], spikes.times))
+
+
+class TestNoSpikes(unittest.TestCase):
+    def test_no_spikes(self):
+        with open_sample(samples.bxr, "r") as f:
+            spikes = f.get_spikes(waveforms=True)
+            self.assertEqual(0, len(spikes))
+            self.assertEqual((0, 0), spikes.waveforms.shape)
+            self.assertEqual([], list(f.iter_spikes()))